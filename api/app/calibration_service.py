@@ -50,6 +50,8 @@ class CalibrationJob:
         self.error: Optional[str] = None
         self.result: Optional[Dict] = None
         self.temp_dir: Optional[str] = None
+        # Set once run_calibration has finished, whether it succeeded or failed
+        self.finished = asyncio.Event()
 
     def to_dict(self) -> Dict:
         """Convert job to dictionary representation"""
@@ -66,6 +68,25 @@ class CalibrationJob:
         }
 
 
+def _start_r(cmd: List[str]) -> subprocess.Popen:
+    """Start Rscript with stderr merged into a line-buffered text stdout"""
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,  # Merge stderr into stdout like Celery
+        text=True,
+        bufsize=1
+    )
+
+
+def _load_r_output(path: str) -> Optional[Dict]:
+    """Read the JSON file the R script wrote, or None if it produced no output"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 class CalibrationService:
     """Service for managing calibration jobs with real-time updates"""
 
@@ -91,6 +112,15 @@ class CalibrationService:
         job = self.get_job(job_id)
         return job.to_dict() if job else None
 
+    async def wait_for_job(self, job_id: str) -> Optional[CalibrationJob]:
+        """Wait for a job to finish running; None if the job is unknown"""
+        job = self.get_job(job_id)
+        if job is None:
+            job = next((j for j in self.job_history if j.job_id == job_id), None)
+        if job is not None:
+            await job.finished.wait()
+        return job
+
     async def run_calibration(self, job_id: str) -> Dict:
         """Run calibration with real-time progress updates"""
         job = self.get_job(job_id)
@@ -157,6 +187,7 @@ class CalibrationService:
                     await self._send_log(job_id, f"Cleaned up temporary directory")
                 except Exception as e:
                     logger.error(f"Failed to cleanup temp directory: {e}")
+            job.finished.set()
 
     async def _prepare_input_files(self, job: CalibrationJob) -> tuple[str, str]:
         """Prepare input files for R script"""
@@ -211,14 +242,7 @@ class CalibrationService:
         await self._send_log(job.job_id, f"Running command: {' '.join(cmd)}")
 
         # Use synchronous subprocess like Celery endpoint (asyncio version has issues)
-        import subprocess
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,  # Merge stderr into stdout like Celery
-            text=True,
-            bufsize=1
-        )
+        process = _start_r(cmd)
 
         # Read and log output line by line (synchronously)
         for line in process.stdout:
@@ -242,10 +266,8 @@ class CalibrationService:
         return_code = process.wait()
 
         # Check results
-        if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                output_data = json.load(f)
-
+        output_data = _load_r_output(output_file)
+        if output_data is not None:
             if output_data.get("success"):
                 await self._send_log(job.job_id, "R calibration completed successfully")
                 return {
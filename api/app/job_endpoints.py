@@ -10,49 +10,73 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Optional, Union, Any
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import uuid
 import json
+import time
 import tempfile
 import os
 import subprocess
 import asyncio
+import gzip
+import math
 import redis
+import redis.asyncio
 import hashlib
-from celery import Celery
+from collections import OrderedDict
+from redis.client import NEVER_DECODE
+from celery import Celery, states
+from celery.signals import task_postrun
+from celery.backends.base import BaseKeyValueStoreBackend
 from celery.result import AsyncResult
 
+# Try to import orjson - optional faster encoder/decoder for stored job blobs
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
 from .r_script_generator import generate_calibration_r_script
+from .validation import COUNTRY_PATTERN, MAX_COUNTRY_LENGTH
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Initialize Redis client for caching and job storage
-# Use REDIS_URL if available (for Upstash or other hosted Redis)
-# Fall back to REDIS_HOST/PORT for local development
-redis_url = os.getenv("REDIS_URL")
-if redis_url:
-    # For SSL Redis connections (rediss://), handle SSL certificate requirements
-    if redis_url.startswith("rediss://"):
-        import ssl
-        redis_client = redis.from_url(
-            redis_url,
-            decode_responses=True,
-            ssl_cert_reqs=ssl.CERT_NONE
-        )
-    else:
-        redis_client = redis.from_url(
+
+def _connect_redis(client_module):
+    """Create a client for the configured Redis; client_module is redis or redis.asyncio"""
+    # Use REDIS_URL if available (for Upstash or other hosted Redis)
+    # Fall back to REDIS_HOST/PORT for local development
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        # For SSL Redis connections (rediss://), handle SSL certificate requirements
+        if redis_url.startswith("rediss://"):
+            import ssl
+            return client_module.from_url(
+                redis_url,
+                decode_responses=True,
+                ssl_cert_reqs=ssl.CERT_NONE
+            )
+        return client_module.from_url(
             redis_url,
             decode_responses=True
         )
-else:
-    redis_client = redis.Redis(
+    return client_module.Redis(
         host=os.getenv("REDIS_HOST", "localhost"),
         port=int(os.getenv("REDIS_PORT", 6379)),
         db=0,
         decode_responses=True
     )
 
+
+# Initialize Redis client for caching and job storage
+redis_client = _connect_redis(redis)
+# Async client for waits that must not block the event loop (status long-polls)
+async_redis_client = _connect_redis(redis.asyncio)
+
 # Initialize Celery for background job processing
 broker_url = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/1")
 backend_url = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/2")
@@ -75,6 +99,37 @@ if broker_url.startswith("rediss://") or backend_url.startswith("rediss://"):
 CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))  # 1 hour default
 MAX_LOG_ENTRIES = 1000
 BATCH_MAX_SIZE = 50
+# Per-user job creation limit; 0 turns rate limiting off
+MAX_JOBS_PER_HOUR = int(os.getenv("MAX_JOBS_PER_HOUR", 100))
+if MAX_JOBS_PER_HOUR < 0:
+    raise ValueError(f"MAX_JOBS_PER_HOUR must be 0 (disabled) or positive, got {MAX_JOBS_PER_HOUR}")
+EPOCH = datetime(1970, 1, 1)
+
+# Rendered /jobs/{id} responses kept in-process for polls that arrive between writes;
+# an entry is dropped once the job's version moves on or after STATUS_CACHE_TTL seconds
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", 2))
+STATUS_CACHE_SIZE = 1024
+
+# R results are large, repetitive JSON; gzip shrinks them several times over
+RESULT_COMPRESSLEVEL = 6
+# Requests (va_data included) are written on the submit path, so favour speed
+REQUEST_COMPRESSLEVEL = 1
+GZIP_MAGIC = b"\x1f\x8b"
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def _register_lua_script(filename: str):
+    """Register a Lua script from SCRIPTS_DIR (executed via EVALSHA by redis-py)"""
+    with open(os.path.join(SCRIPTS_DIR, filename)) as f:
+        return redis_client.register_script(f.read())
+
+
+# Server-side ownership check: existence + user_id comparison in one round trip
+job_owner_check = _register_lua_script("job_owner_check.lua")
+# Atomic token bucket used to limit job creation per user
+rate_limit_bucket = _register_lua_script("rate_limit.lua")
+# Check-and-set cancellation: rejects finished jobs and publishes the event atomically
+job_cancel = _register_lua_script("job_cancel.lua")
 
 
 class JobStatus(str, Enum):
@@ -87,6 +142,13 @@ class JobStatus(str, Enum):
     TIMEOUT = "timeout"
 
 
+# Status values a job never leaves once its metadata records them (plain strings,
+# as found in decoded metadata; compare JobStatus members by .value)
+FINISHED_STATUSES = frozenset(
+    status.value for status in (JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.TIMEOUT)
+)
+
+
 class LogLevel(str, Enum):
     """Log entry levels"""
     DEBUG = "debug"
@@ -131,6 +193,10 @@ class JobMetadata(BaseModel):
     priority: int = Field(default=5, description="Job priority (1-10, higher = more priority)", ge=1, le=10)
     retry_count: int = Field(default=0, description="Number of retry attempts", ge=0)
     max_retries: int = Field(default=3, description="Maximum retry attempts", ge=0)
+    user_id: Optional[str] = Field(default=None, description="Owner of the job, if authenticated")
+    status: Optional[JobStatus] = Field(default=None, description="Final status, recorded once the job has finished")
+    age_group: Optional[str] = Field(default=None, description="Age group of the calibration request")
+    country: Optional[str] = Field(default=None, description="Country of the calibration request")
 
 
 class CalibrationJobRequest(BaseModel):
@@ -145,7 +211,9 @@ class CalibrationJobRequest(BaseModel):
     )
     country: str = Field(
         default="Mozambique",
-        description="Country for calibration"
+        description="Country for calibration",
+        max_length=MAX_COUNTRY_LENGTH,
+        pattern=COUNTRY_PATTERN
     )
     mmat_type: str = Field(
         default="prior",
@@ -177,8 +245,8 @@ class BatchCalibrationRequest(BaseModel):
     """Request model for batch calibration jobs"""
     jobs: List[CalibrationJobRequest] = Field(
         description="List of calibration jobs to process",
-        min_items=1,
-        max_items=BATCH_MAX_SIZE
+        min_length=1,
+        max_length=BATCH_MAX_SIZE
     )
     batch_name: Optional[str] = Field(default=None, description="Optional batch identifier")
     parallel_limit: int = Field(
@@ -207,9 +275,34 @@ class JobStatusResponse(BaseModel):
     metadata: JobMetadata = Field(description="Job metadata")
     logs: List[JobLogEntry] = Field(description="Job execution logs")
     result_summary: Optional[Dict[str, Any]] = Field(default=None, description="Brief result summary")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Full result, when requested with include_result")
     error_details: Optional[Dict[str, Any]] = Field(default=None, description="Error information if failed")
 
 
+class JobStatusBatchRequest(BaseModel):
+    """Request model for polling several jobs at once"""
+    job_ids: List[str] = Field(
+        description="Jobs to report on, in the order they should be returned",
+        min_length=1,
+        max_length=BATCH_MAX_SIZE
+    )
+
+
+class JobStatusSummary(BaseModel):
+    """Status and progress of one job in a batch status poll"""
+    job_id: str = Field(description="Job identifier")
+    found: bool = Field(description="Whether the job exists (and belongs to the caller)")
+    status: Optional[JobStatus] = Field(default=None, description="Current job status")
+    progress: Optional[JobProgress] = Field(default=None, description="Job progress information")
+    created_at: Optional[datetime] = Field(default=None, description="Job creation timestamp")
+    completed_at: Optional[datetime] = Field(default=None, description="Job completion timestamp")
+
+
+class JobStatusBatchResponse(BaseModel):
+    """Response model for batch status polls"""
+    jobs: List[JobStatusSummary] = Field(description="One entry per requested job, in request order")
+
+
 class JobListFilter(BaseModel):
     """Filter parameters for job listing"""
     status: Optional[JobStatus] = Field(default=None, description="Filter by job status")
@@ -267,6 +360,16 @@ class CacheStats(BaseModel):
 
 
 # Helper functions
+def now_ms() -> int:
+    """Current time as integer epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+
+def ms_to_datetime(ms: int) -> datetime:
+    """Naive UTC datetime for epoch milliseconds, as stored in job metadata"""
+    return EPOCH + timedelta(milliseconds=ms)
+
+
 def generate_job_id() -> str:
     """Generate unique job ID"""
     return f"job_{uuid.uuid4().hex[:12]}"
@@ -291,8 +394,64 @@ def get_cache_key(request_data: Dict[str, Any]) -> str:
     return f"calibration_result:{hashlib.md5(cache_str.encode()).hexdigest()}"
 
 
-def log_job_event(job_id: str, level: LogLevel, message: str, component: str = None, data: Dict[str, Any] = None):
-    """Log an event for a job"""
+def user_jobs_key(user_id: str) -> str:
+    """Sorted set of a user's job ids, scored by creation time"""
+    return f"user:{user_id}:jobs"
+
+
+def index_user_job(user_id: str, job_id: str, created_ms: int, pipe: redis.client.Pipeline):
+    """Queue adding job_id to its owner's job index on pipe, scored by creation time (epoch ms)"""
+    index_key = user_jobs_key(user_id)
+    pipe.zadd(index_key, {job_id: created_ms})
+    pipe.expire(index_key, CACHE_TTL * 24)  # Lives as long as the newest job's metadata
+
+
+def backfill_user_job_index(user_id: str) -> int:
+    """Index user_id's jobs created before the user:{id}:jobs index existed.
+
+    Scans job_metadata:* once per user; a marker key (with the metadata's TTL)
+    stops later empty listings from scanning again. Returns how many jobs were added.
+    """
+    marker_key = f"{user_jobs_key(user_id)}:backfilled"
+    if not redis_client.set(marker_key, 1, nx=True, ex=CACHE_TTL * 24):
+        return 0
+
+    keys = list(redis_client.scan_iter(match="job_metadata:*", count=1000))
+    blobs = redis_client.mget(keys) if keys else []
+
+    pipe = redis_client.pipeline(transaction=False)
+    added = 0
+    for metadata_data in blobs:
+        if not metadata_data:
+            continue
+        try:
+            metadata = json_loads(metadata_data)
+            if metadata.get("user_id") != user_id:
+                continue
+            created_at = datetime.fromisoformat(metadata["created_at"])
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            created_ms = int((created_at - EPOCH).total_seconds() * 1000)
+        except Exception:
+            continue  # Skip malformed metadata
+        index_user_job(user_id, metadata["job_id"], created_ms, pipe)
+        added += 1
+    if added:
+        pipe.execute()
+    return added
+
+
+def log_job_event(
+    job_id: str,
+    level: LogLevel,
+    message: str,
+    component: str = None,
+    data: Dict[str, Any] = None,
+    pipe: Optional[redis.client.Pipeline] = None
+):
+    """Log an event for a job (queued on pipe instead of sent immediately if given)"""
+    # Store, trim, expire and publish go out together: one round trip per event
+    r = redis_client.pipeline(transaction=False) if pipe is None else pipe
     log_entry = JobLogEntry(
         timestamp=datetime.utcnow(),
         level=level,
@@ -303,9 +462,10 @@ def log_job_event(job_id: str, level: LogLevel, message: str, component: str = N
 
     # Store in Redis with job logs
     log_key = f"job_logs:{job_id}"
-    redis_client.lpush(log_key, log_entry.model_dump_json())
-    redis_client.ltrim(log_key, 0, MAX_LOG_ENTRIES - 1)  # Keep only recent logs
-    redis_client.expire(log_key, CACHE_TTL * 24)  # Keep logs longer than results
+    r.lpush(log_key, log_entry.model_dump_json())
+    r.ltrim(log_key, 0, MAX_LOG_ENTRIES - 1)  # Keep only recent logs
+    r.expire(log_key, CACHE_TTL * 24)  # Keep logs longer than results
+    bump_job_version(job_id, r)
 
     # Publish to Redis channel for WebSocket broadcasting
     try:
@@ -320,13 +480,38 @@ def log_job_event(job_id: str, level: LogLevel, message: str, component: str = N
                 "source": component or "system"
             }
         }
-        redis_client.publish(channel, json.dumps(message_data))
+        r.publish(channel, json_dumps(message_data))
     except Exception as e:
         # Don't fail the job if Redis publish fails
         logger.warning(f"Failed to publish log to Redis channel: {e}")
 
+    if pipe is None:
+        r.execute()
+
+
+def job_events_channel(job_id: str) -> str:
+    """Channel that gets a message whenever a job's progress or state changes"""
+    return f"job:{job_id}:events"
+
+
+def job_version_key(job_id: str) -> str:
+    """Counter bumped on every write that can change a job's status response"""
+    return f"job_version:{job_id}"
 
-def update_job_progress(job_id: str, current_step: int, total_steps: int, step_name: str):
+
+def bump_job_version(job_id: str, r):
+    """Queue a version bump on r (a pipeline, or the client itself)"""
+    r.incr(job_version_key(job_id))
+    r.expire(job_version_key(job_id), CACHE_TTL * 24)
+
+
+def update_job_progress(
+    job_id: str,
+    current_step: int,
+    total_steps: int,
+    step_name: str,
+    pipe: Optional[redis.client.Pipeline] = None
+):
     """Update job progress"""
     progress_percentage = (current_step / total_steps) * 100
     progress = JobProgress(
@@ -337,7 +522,12 @@ def update_job_progress(job_id: str, current_step: int, total_steps: int, step_n
     )
 
     progress_key = f"job_progress:{job_id}"
-    redis_client.set(progress_key, progress.model_dump_json(), ex=CACHE_TTL)
+    r = redis_client.pipeline(transaction=False) if pipe is None else pipe
+    r.set(progress_key, progress.model_dump_json(), ex=CACHE_TTL)
+    bump_job_version(job_id, r)
+    r.publish(job_events_channel(job_id), "progress")
+    if pipe is None:
+        r.execute()
 
 
 def get_job_metadata(job_id: str) -> Optional[JobMetadata]:
@@ -349,10 +539,87 @@ def get_job_metadata(job_id: str) -> Optional[JobMetadata]:
     return None
 
 
-def store_job_metadata(job_id: str, metadata: JobMetadata):
+def store_job_metadata(job_id: str, metadata: JobMetadata, pipe: Optional[redis.client.Pipeline] = None):
     """Store job metadata in Redis"""
     metadata_key = f"job_metadata:{job_id}"
-    redis_client.set(metadata_key, metadata.model_dump_json(), ex=CACHE_TTL * 24)
+    r = redis_client.pipeline(transaction=False) if pipe is None else pipe
+    r.set(metadata_key, metadata.model_dump_json(), ex=CACHE_TTL * 24)
+    bump_job_version(job_id, r)
+    if pipe is None:
+        r.execute()
+
+
+def update_job_metadata(job_id: str, metadata: JobMetadata) -> bool:
+    """Store metadata written by the worker, unless the job was cancelled meanwhile.
+
+    The worker's read-modify-write would otherwise overwrite the 'cancelled' status
+    job_cancel.lua sets; WATCH makes the write fail if cancellation lands between the
+    check and the SET. Returns False (writing nothing) if the job has been cancelled.
+    """
+    metadata_key = f"job_metadata:{job_id}"
+    with redis_client.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(metadata_key)
+                metadata_data = pipe.get(metadata_key)
+                if metadata_data and json_loads(metadata_data).get("status") == JobStatus.CANCELLED.value:
+                    return False
+                pipe.multi()
+                store_job_metadata(job_id, metadata, pipe=pipe)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                continue  # Metadata changed under us; check again
+
+
+def check_job_owner(job_id: str, user_id: str):
+    """Raise 404 if the job does not exist or 403 if it belongs to another user"""
+    try:
+        found = job_owner_check(keys=[f"job_metadata:{job_id}"], args=[user_id], client=redis_client)
+    except redis.exceptions.ResponseError as e:
+        if "FORBIDDEN" in str(e):
+            raise HTTPException(status_code=403, detail=f"Access to job {job_id} denied")
+        raise
+
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+
+def check_rate_limit(user_id: str, cost: int = 1):
+    """Take cost job-creation tokens for user_id, raising 429 when the bucket is short"""
+    if not MAX_JOBS_PER_HOUR:
+        return
+
+    if cost > MAX_JOBS_PER_HOUR:
+        # The bucket never holds this many tokens, so waiting would not help
+        raise HTTPException(
+            status_code=400,
+            detail=f"{cost} jobs exceed the limit of {MAX_JOBS_PER_HOUR} per hour"
+        )
+
+    allowed, retry_after_ms = rate_limit_bucket(
+        keys=[f"bucket:{user_id}"],
+        args=[MAX_JOBS_PER_HOUR, MAX_JOBS_PER_HOUR / 3600, time.time(), cost],
+        client=redis_client
+    )
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Job limit of {MAX_JOBS_PER_HOUR} per hour exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after_ms / 1000)))}
+        )
+
+
+def get_job_request_fields(metadata: JobMetadata) -> Dict[str, Optional[str]]:
+    """Get age_group/country for a job without decoding its full request when possible"""
+    if metadata.age_group is not None:
+        return {"age_group": metadata.age_group, "country": metadata.country}
+
+    # Jobs created before these fields were added to the metadata
+    request_obj = load_job_request(metadata.job_id)
+    if request_obj:
+        return {"age_group": request_obj.get("age_group"), "country": request_obj.get("country")}
+    return {"age_group": None, "country": None}
 
 
 def get_job_progress(job_id: str) -> Optional[JobProgress]:
@@ -381,24 +648,82 @@ def get_job_logs(job_id: str, level_filter: LogLevel = None, limit: int = 100, o
     return logs
 
 
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Brief summary of a calibration result, as shown in job status"""
+    return {
+        "algorithms_processed": len(result.get("calibrated", {})),
+        "age_group": result.get("age_group"),
+        "country": result.get("country"),
+        "completion_time": result.get("completed_at")
+    }
+
+
+def decode_json_blob(blob: bytes) -> Any:
+    """Decode a stored JSON blob, gunzipping it first if it was compressed"""
+    if blob[:2] == GZIP_MAGIC:
+        blob = gzip.decompress(blob)
+    return json_loads(blob)  # Blobs stored before compression are plain JSON
+
+
+def get_raw(key: str, pipe: Optional[redis.client.Pipeline] = None):
+    """GET a key as raw bytes: the client decodes replies as text, and blobs may be gzip"""
+    r = redis_client if pipe is None else pipe
+    return r.execute_command("GET", key, **{NEVER_DECODE: []})
+
+
+def load_job_result(job_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve a job's full result from Redis (None if missing)"""
+    blob = get_raw(f"job_result:{job_id}")
+    return decode_json_blob(blob) if blob is not None else None
+
+
+def load_job_request(job_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve the request a job was submitted with (None if missing)"""
+    blob = get_raw(f"job_request:{job_id}")
+    return decode_json_blob(blob) if blob is not None else None
+
+
+def store_job_request(job_id: str, request: CalibrationJobRequest, pipe: redis.client.Pipeline):
+    """Queue a job's request, compressed, for the worker to load by job ID"""
+    blob = gzip.compress(request.model_dump_json().encode(), REQUEST_COMPRESSLEVEL)
+    pipe.set(f"job_request:{job_id}", blob, ex=CACHE_TTL * 24)
+
+
 def store_job_result(job_id: str, result: Dict[str, Any], use_cache: bool = True):
     """Store job result in Redis"""
     result_key = f"job_result:{job_id}"
-    redis_client.set(result_key, json.dumps(result), ex=CACHE_TTL * 24)
+    # The summary is kept next to the result so status polls never read the full blob
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.set(result_key, gzip.compress(json_dumps(result), RESULT_COMPRESSLEVEL), ex=CACHE_TTL * 24)
+    pipe.set(f"job_result_summary:{job_id}", json_dumps(summarize_result(result)), ex=CACHE_TTL * 24)
+    bump_job_version(job_id, pipe)
+    pipe.execute()
 
     # Also cache by request hash if caching is enabled
     if use_cache:
-        metadata = get_job_metadata(job_id)
-        if metadata:
-            request_data = redis_client.get(f"job_request:{job_id}")
-            if request_data:
-                cache_key = get_cache_key(json.loads(request_data))
-                cache_data = {
-                    "result": result,
-                    "cached_at": datetime.utcnow().isoformat(),
-                    "job_id": job_id
-                }
-                redis_client.set(cache_key, json.dumps(cache_data), ex=CACHE_TTL)
+        # Existence check and request fetch in one round trip, without decoding the metadata
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.exists(f"job_metadata:{job_id}")
+        get_raw(f"job_request:{job_id}", pipe)
+        metadata_exists, request_data = pipe.execute()
+        if metadata_exists and request_data:
+            cache_key = get_cache_key(decode_json_blob(request_data))
+            cache_data = {
+                "result": result,
+                "cached_at_ms": now_ms(),
+                "job_id": job_id
+            }
+            redis_client.set(cache_key, json_dumps(cache_data), ex=CACHE_TTL)
+
+
+def cached_at_ms(cache_obj: Dict[str, Any]) -> Optional[int]:
+    """When a cache entry was written, in epoch milliseconds (None if unknown)"""
+    if "cached_at_ms" in cache_obj:
+        return cache_obj["cached_at_ms"]
+    if "cached_at" in cache_obj:
+        # Entries written before the numeric field carry an ISO string
+        return (datetime.fromisoformat(cache_obj["cached_at"]) - EPOCH) // timedelta(milliseconds=1)
+    return None
 
 
 def get_cached_result(request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -406,22 +731,58 @@ def get_cached_result(request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     cache_key = get_cache_key(request_data)
     cached_data = redis_client.get(cache_key)
     if cached_data:
-        return json.loads(cached_data)
+        return json_loads(cached_data)
     return None
 
 
+def _start_r(cmd: List[str]) -> subprocess.Popen:
+    """Start Rscript with stderr merged into a line-buffered text stdout"""
+    # Set R to unbuffered output
+    env = os.environ.copy()
+    env['R_DEFAULT_DEVICE'] = 'pdf'  # Prevent X11 issues
+
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,  # Merge stderr into stdout
+        text=True,
+        bufsize=1,  # Line buffered
+        env=env,
+        universal_newlines=True
+    )
+
+
+def _load_r_output(path: str) -> Optional[Dict[str, Any]]:
+    """Read the JSON file the R script wrote, or None if it produced no output"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 # Celery tasks
 @celery_app.task(bind=True)
-def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
-    """Celery task to run calibration job"""
+def run_calibration_task(self, job_id: str, request_data: Optional[Dict[str, Any]] = None):
+    """Celery task to run calibration job
+
+    The request is loaded from Redis by job ID; request_data is only passed by
+    callers that queue a request without storing it.
+    """
     try:
+        if request_data is None:
+            request_data = load_job_request(job_id)
+            if request_data is None:
+                raise ValueError(f"Job request not found for {job_id}")
+
         # Update job status to running
         metadata = get_job_metadata(job_id)
         if not metadata:
             raise ValueError(f"Job metadata not found for {job_id}")
 
         metadata.started_at = datetime.utcnow()
-        store_job_metadata(job_id, metadata)
+        if not update_job_metadata(job_id, metadata):
+            log_job_event(job_id, LogLevel.WARNING, "Job was cancelled before it started", "celery_worker")
+            return {"status": "cancelled"}
 
         log_job_event(job_id, LogLevel.INFO, "Starting calibration job", "celery_worker")
         update_job_progress(job_id, 1, 5, "Initializing")
@@ -434,11 +795,12 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
                 update_job_progress(job_id, 5, 5, "Completed (cached)")
 
                 metadata.completed_at = datetime.utcnow()
-                store_job_metadata(job_id, metadata)
+                metadata.status = JobStatus.SUCCESS
+                update_job_metadata(job_id, metadata)
 
                 result = cached_result["result"]
                 result["cache_info"] = {
-                    "cached_at": cached_result["cached_at"],
+                    "cached_at": ms_to_datetime(cached_at_ms(cached_result)).isoformat(),
                     "source_job_id": cached_result["job_id"]
                 }
 
@@ -477,20 +839,8 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
             timeout_minutes = request_data.get("timeout_minutes", 30)
             cmd = ["Rscript", "--vanilla", r_script_file, input_file, output_file, job_id]
 
-            # Set R to unbuffered output
-            env = os.environ.copy()
-            env['R_DEFAULT_DEVICE'] = 'pdf'  # Prevent X11 issues
-
             # Simple subprocess with line-by-line output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,  # Merge stderr into stdout
-                text=True,
-                bufsize=1,  # Line buffered
-                env=env,
-                universal_newlines=True
-            )
+            process = _start_r(cmd)
 
             # Read and log output line by line
             output_lines = []
@@ -520,10 +870,8 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
             update_job_progress(job_id, 4, 5, "Processing results")
 
             # Process output
-            if os.path.exists(output_file):
-                with open(output_file, 'r') as f:
-                    output_data = json.load(f)
-
+            output_data = _load_r_output(output_file)
+            if output_data is not None:
                 if output_data.get("success"):
                     log_job_event(job_id, LogLevel.INFO, "Calibration completed successfully", "r_processor")
 
@@ -540,7 +888,8 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
                     update_job_progress(job_id, 5, 5, "Completed")
 
                     metadata.completed_at = datetime.utcnow()
-                    store_job_metadata(job_id, metadata)
+                    metadata.status = JobStatus.SUCCESS
+                    update_job_metadata(job_id, metadata)
 
                     return {"status": "success", "result": result_data}
                 else:
@@ -557,7 +906,8 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
         metadata = get_job_metadata(job_id)
         if metadata:
             metadata.completed_at = datetime.utcnow()
-            store_job_metadata(job_id, metadata)
+            metadata.status = JobStatus.TIMEOUT
+            update_job_metadata(job_id, metadata)
         return {"status": "timeout", "error": "Job execution timed out"}
 
     except Exception as e:
@@ -565,62 +915,134 @@ def run_calibration_task(self, job_id: str, request_data: Dict[str, Any]):
         metadata = get_job_metadata(job_id)
         if metadata:
             metadata.completed_at = datetime.utcnow()
-            store_job_metadata(job_id, metadata)
+            metadata.status = JobStatus.FAILED
+            update_job_metadata(job_id, metadata)
         return {"status": "failed", "error": str(e)}
 
 
 
-async def get_job_status(job_id: str, log_level: Optional[LogLevel] = None, log_limit: int = 100, log_offset: int = 0) -> JobStatusResponse:
-    """Get comprehensive job status with logs and progress"""
+@task_postrun.connect(sender=run_calibration_task)
+def _publish_task_finished(task_id=None, **kwargs):
+    """Wake status long-polls once the task's final state is in the result backend"""
+    try:
+        redis_client.publish(job_events_channel(task_id), "finished")
+    except Exception as e:
+        logger.warning(f"Failed to publish job event to Redis channel: {e}")
 
-    # Get job metadata
-    metadata = get_job_metadata(job_id)
-    if not metadata:
+
+async def wait_for_job_event(job_id: str, timeout: float) -> bool:
+    """Wait up to timeout seconds for the job's next event.
+
+    Returns True as soon as an event is published (or at once if the job has
+    already finished), False on timeout. Raises 404 if the job does not exist.
+    """
+    metadata_key = f"job_metadata:{job_id}"
+    if not await async_redis_client.exists(metadata_key):
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-    # Get job progress
-    progress = get_job_progress(job_id)
+    pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(job_events_channel(job_id))
+        # Checked after subscribing, so a transition in between can't be missed
+        metadata_data = await async_redis_client.get(metadata_key)
+        if not metadata_data or json_loads(metadata_data).get("status") in FINISHED_STATUSES:
+            return True
+        # AsyncResult reads the result backend synchronously; keep it off the event loop
+        celery_state = await asyncio.to_thread(lambda: AsyncResult(job_id, app=celery_app).state)
+        if celery_state in states.READY_STATES:
+            return True
+        try:
+            async with asyncio.timeout(timeout):
+                async for _ in pubsub.listen():
+                    return True
+        except TimeoutError:
+            return False
+    finally:
+        await pubsub.aclose()
+
+
+async def get_job_status(
+    job_id: str,
+    log_level: Optional[LogLevel] = None,
+    log_limit: int = 100,
+    log_offset: int = 0,
+    user_id: Optional[str] = None,
+    include_result: bool = False,
+    wait: float = 0
+) -> JobStatusResponse:
+    """Get comprehensive job status with logs and progress
+
+    The full result is only read when include_result is set; otherwise a
+    completed job reports just its stored summary. With wait > 0 this is a
+    long-poll: the status is read once the job next changes, or after wait seconds.
+    """
+
+    # Enforce ownership for authenticated callers
+    if user_id is not None:
+        check_job_owner(job_id, user_id)
+
+    if wait > 0:
+        await wait_for_job_event(job_id, wait)
+
+    # Get job metadata and progress in one round trip
+    metadata_data, progress_data = redis_client.mget(f"job_metadata:{job_id}", f"job_progress:{job_id}")
+    if not metadata_data:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    metadata = JobMetadata.model_validate_json(metadata_data)
+    progress = JobProgress.model_validate_json(progress_data) if progress_data else None
 
     # Get job logs with filtering
     logs = get_job_logs(job_id, log_level, log_limit, log_offset)
 
-    # Get Celery task status
-    celery_result = AsyncResult(job_id, app=celery_app)
-
-    # Determine job status
-    if celery_result.state == "PENDING":
-        status = JobStatus.PENDING
-    elif celery_result.state == "STARTED":
-        status = JobStatus.RUNNING
-    elif celery_result.state == "SUCCESS":
-        status = JobStatus.SUCCESS
-    elif celery_result.state == "FAILURE":
-        status = JobStatus.FAILED
-    elif celery_result.state == "REVOKED":
-        status = JobStatus.CANCELLED
+    # A finished job's status is recorded in its metadata; only jobs still in
+    # flight need a read from the Celery result backend
+    celery_result = None
+    if metadata.status is not None:
+        status = metadata.status
     else:
-        status = JobStatus.PENDING
+        celery_result = AsyncResult(job_id, app=celery_app)
+
+        # Determine job status
+        if celery_result.state == "PENDING":
+            status = JobStatus.PENDING
+        elif celery_result.state == "STARTED":
+            status = JobStatus.RUNNING
+        elif celery_result.state == "SUCCESS":
+            status = JobStatus.SUCCESS
+        elif celery_result.state == "FAILURE":
+            status = JobStatus.FAILED
+        elif celery_result.state == "REVOKED":
+            status = JobStatus.CANCELLED
+        else:
+            status = JobStatus.PENDING
 
     # Get result summary if completed
     result_summary = None
+    result = None
     error_details = None
 
     if status == JobStatus.SUCCESS:
-        result_data = redis_client.get(f"job_result:{job_id}")
-        if result_data:
-            full_result = json.loads(result_data)
-            result_summary = {
-                "algorithms_processed": len(full_result.get("calibrated", {})),
-                "age_group": full_result.get("age_group"),
-                "country": full_result.get("country"),
-                "completion_time": full_result.get("completed_at")
+        if include_result:
+            result = load_job_result(job_id)
+            if result is not None:
+                result_summary = summarize_result(result)
+        else:
+            summary_data = redis_client.get(f"job_result_summary:{job_id}")
+            if summary_data:
+                result_summary = json_loads(summary_data)
+            else:
+                # Jobs finished before summaries were stored separately
+                full_result = load_job_result(job_id)
+                if full_result is not None:
+                    result_summary = summarize_result(full_result)
+    elif status == JobStatus.FAILED:
+        celery_result = celery_result or AsyncResult(job_id, app=celery_app)
+        if celery_result.failed():
+            error_details = {
+                "error_type": type(celery_result.result).__name__ if celery_result.result else "Unknown",
+                "error_message": str(celery_result.result) if celery_result.result else "Job failed",
+                "traceback": celery_result.traceback if hasattr(celery_result, 'traceback') else None
             }
-    elif status == JobStatus.FAILED and celery_result.failed():
-        error_details = {
-            "error_type": type(celery_result.result).__name__ if celery_result.result else "Unknown",
-            "error_message": str(celery_result.result) if celery_result.result else "Job failed",
-            "traceback": celery_result.traceback if hasattr(celery_result, 'traceback') else None
-        }
 
     return JobStatusResponse(
         job_id=job_id,
@@ -629,38 +1051,95 @@ async def get_job_status(job_id: str, log_level: Optional[LogLevel] = None, log_
         metadata=metadata,
         logs=logs,
         result_summary=result_summary,
+        result=result,
         error_details=error_details
     )
 
 
-async def create_calibration_job(request: CalibrationJobRequest, background_tasks: BackgroundTasks) -> Dict[str, str]:
+_status_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+async def render_job_status(
+    job_id: str,
+    user_id: Optional[str] = None,
+    include_result: bool = False,
+    wait: float = 0
+) -> bytes:
+    """get_job_status serialized to JSON, reusing the last rendering while the job is unchanged
+
+    A poll is answered from the in-process cache when the job's version counter
+    matches the cached one; full results are never cached.
+    """
+    if include_result:
+        status = await get_job_status(job_id, user_id=user_id, include_result=True, wait=wait)
+        return status.model_dump_json().encode()
+
+    if user_id is not None:
+        check_job_owner(job_id, user_id)
+    if wait > 0:
+        await wait_for_job_event(job_id, wait)
+
+    # Read the version before rendering, so a write that lands mid-render invalidates the entry
+    version = redis_client.get(job_version_key(job_id))
+    cache_key = (job_id, version)
+    now = time.monotonic()
+    cached = _status_cache.get(cache_key) if version is not None else None
+    if cached is not None and cached[0] > now:
+        _status_cache.move_to_end(cache_key)
+        return cached[1]
+
+    status = await get_job_status(job_id)
+    body = status.model_dump_json().encode()
+    if version is not None:
+        _status_cache[cache_key] = (now + STATUS_CACHE_TTL, body)
+        _status_cache.move_to_end(cache_key)
+        if len(_status_cache) > STATUS_CACHE_SIZE:
+            _status_cache.popitem(last=False)
+    return body
+
+
+async def create_calibration_job(
+    request: CalibrationJobRequest,
+    background_tasks: BackgroundTasks,
+    user_id: Optional[str] = None
+) -> Dict[str, str]:
     """Create a new calibration job"""
 
+    if user_id is not None:
+        check_rate_limit(user_id)
+
     job_id = generate_job_id()
 
-    # Create job metadata
-    timeout_at = datetime.utcnow() + timedelta(minutes=request.timeout_minutes)
+    # Create job metadata; the index score and created_at share one clock reading
+    created_ms = now_ms()
+    created_at = ms_to_datetime(created_ms)
+    timeout_at = created_at + timedelta(minutes=request.timeout_minutes)
     metadata = JobMetadata(
         job_id=job_id,
         job_type="calibration",
-        created_at=datetime.utcnow(),
+        created_at=created_at,
         timeout_at=timeout_at,
-        priority=request.priority
+        priority=request.priority,
+        user_id=user_id,
+        age_group=request.age_group.value,
+        country=request.country
     )
 
-    # Store job metadata and request
-    store_job_metadata(job_id, metadata)
-    redis_client.set(f"job_request:{job_id}", request.model_dump_json(), ex=CACHE_TTL * 24)
-
-    # Initialize job progress
-    update_job_progress(job_id, 0, 5, "Queued")
-    log_job_event(job_id, LogLevel.INFO, f"Job created with priority {request.priority}", "api")
-
-    # Submit to Celery with custom task ID
-    request_data = request.model_dump()
+    # Store job metadata, request, initial progress and log in one round trip
+    pipe = redis_client.pipeline(transaction=True)
+    store_job_metadata(job_id, metadata, pipe=pipe)
+    if user_id is not None:
+        index_user_job(user_id, job_id, created_ms, pipe)
+    store_job_request(job_id, request, pipe)
+    update_job_progress(job_id, 0, 5, "Queued", pipe=pipe)
+    log_job_event(job_id, LogLevel.INFO, f"Job created with priority {request.priority}", "api", pipe=pipe)
+    pipe.execute()
+
+    # Submit to Celery with custom task ID; the worker loads the stored request,
+    # so va_data doesn't travel through the broker a second time
     celery_app.send_task(
         "app.job_endpoints.run_calibration_task",
-        args=[job_id, request_data],
+        args=[job_id],
         task_id=job_id,
         priority=request.priority,
         queue="calibration"
@@ -669,45 +1148,48 @@ async def create_calibration_job(request: CalibrationJobRequest, background_task
     return {"job_id": job_id, "status": "created"}
 
 
-async def create_batch_jobs(request: BatchCalibrationRequest) -> BatchJobResponse:
+async def create_batch_jobs(request: BatchCalibrationRequest, user_id: Optional[str] = None) -> BatchJobResponse:
     """Create multiple calibration jobs for batch processing"""
 
+    # Each job in the batch takes its own token
+    if user_id is not None:
+        check_rate_limit(user_id, cost=len(request.jobs))
+
     batch_id = generate_batch_id()
     job_ids = []
 
+    # Every job's records and the batch's own go out in one MULTI/EXEC round trip,
+    # so no task is queued unless the whole batch was stored
+    pipe = redis_client.pipeline(transaction=True)
+
     # Create individual jobs
     for i, job_request in enumerate(request.jobs):
         job_id = generate_job_id()
         job_ids.append(job_id)
 
         # Create metadata with batch reference
-        timeout_at = datetime.utcnow() + timedelta(minutes=job_request.timeout_minutes)
+        created_ms = now_ms()
+        created_at = ms_to_datetime(created_ms)
+        timeout_at = created_at + timedelta(minutes=job_request.timeout_minutes)
         metadata = JobMetadata(
             job_id=job_id,
             job_type="batch_calibration",
-            created_at=datetime.utcnow(),
+            created_at=created_at,
             timeout_at=timeout_at,
-            priority=job_request.priority
-        )
-
-        # Store job metadata and request
-        store_job_metadata(job_id, metadata)
-        redis_client.set(f"job_request:{job_id}", job_request.model_dump_json(), ex=CACHE_TTL * 24)
-
-        # Initialize progress and logs
-        update_job_progress(job_id, 0, 5, "Queued (batch)")
-        log_job_event(job_id, LogLevel.INFO, f"Job created as part of batch {batch_id}", "batch_api")
-
-        # Submit to Celery
-        request_data = job_request.model_dump()
-        celery_app.send_task(
-            "app.job_endpoints.run_calibration_task",
-            args=[job_id, request_data],
-            task_id=job_id,
             priority=job_request.priority,
-            queue="calibration"
+            user_id=user_id,
+            age_group=job_request.age_group.value,
+            country=job_request.country
         )
 
+        # Queue job metadata, request, initial progress and log
+        store_job_metadata(job_id, metadata, pipe=pipe)
+        if user_id is not None:
+            index_user_job(user_id, job_id, created_ms, pipe)
+        store_job_request(job_id, job_request, pipe)
+        update_job_progress(job_id, 0, 5, "Queued (batch)", pipe=pipe)
+        log_job_event(job_id, LogLevel.INFO, f"Job created as part of batch {batch_id}", "batch_api", pipe=pipe)
+
     # Store batch metadata
     batch_metadata = {
         "batch_id": batch_id,
@@ -718,8 +1200,19 @@ async def create_batch_jobs(request: BatchCalibrationRequest) -> BatchJobRespons
         "fail_fast": request.fail_fast
     }
 
-    redis_client.set(f"batch_metadata:{batch_id}", json.dumps(batch_metadata), ex=CACHE_TTL * 24)
-    redis_client.set(f"batch_jobs:{batch_id}", json.dumps(job_ids), ex=CACHE_TTL * 24)
+    pipe.set(f"batch_metadata:{batch_id}", json_dumps(batch_metadata), ex=CACHE_TTL * 24)
+    pipe.set(f"batch_jobs:{batch_id}", json_dumps(job_ids), ex=CACHE_TTL * 24)
+    pipe.execute()
+
+    # Submit to Celery
+    for job_id, job_request in zip(job_ids, request.jobs):
+        celery_app.send_task(
+            "app.job_endpoints.run_calibration_task",
+            args=[job_id],
+            task_id=job_id,
+            priority=job_request.priority,
+            queue="calibration"
+        )
 
     return BatchJobResponse(
         batch_id=batch_id,
@@ -747,10 +1240,7 @@ async def list_jobs(
 
                 # Apply filters
                 if filters.status:
-                    # Get Celery status for comparison
-                    celery_result = AsyncResult(metadata.job_id, app=celery_app)
-                    job_status = _map_celery_status(celery_result.state)
-                    if job_status != filters.status:
+                    if _resolve_job_status(metadata) != filters.status:
                         continue
 
                 if filters.job_type and metadata.job_type != filters.job_type:
@@ -764,13 +1254,11 @@ async def list_jobs(
 
                 # Check request-specific filters
                 if filters.age_group or filters.country:
-                    request_data = redis_client.get(f"job_request:{metadata.job_id}")
-                    if request_data:
-                        request_obj = json.loads(request_data)
-                        if filters.age_group and request_obj.get("age_group") != filters.age_group:
-                            continue
-                        if filters.country and request_obj.get("country") != filters.country:
-                            continue
+                    request_fields = get_job_request_fields(metadata)
+                    if filters.age_group and request_fields["age_group"] != filters.age_group:
+                        continue
+                    if filters.country and request_fields["country"] != filters.country:
+                        continue
 
                 all_jobs.append(metadata)
 
@@ -796,6 +1284,71 @@ async def list_jobs(
     )
 
 
+def _simple_job_entry(metadata: Dict[str, Any], progress_data: Optional[str], celery_state: str) -> Dict[str, Any]:
+    """Build the frontend's job object from decoded metadata, the raw progress blob
+    and the job's Celery state (see get_celery_states)"""
+    job_id = metadata.get("job_id")
+
+    # A finished status recorded in the metadata wins over the Celery state
+    # (a cancelled job's task may still report PENDING, a failed one SUCCESS)
+    metadata_status = metadata.get("status")
+    if metadata_status in FINISHED_STATUSES:
+        job_status = "completed" if metadata_status == JobStatus.SUCCESS.value else metadata_status
+    # Map Celery status to our status
+    elif celery_state == "PENDING":
+        job_status = "pending"
+    elif celery_state == "STARTED":
+        job_status = "running"
+    elif celery_state == "SUCCESS":
+        job_status = "completed"
+    elif celery_state == "FAILURE":
+        job_status = "failed"
+    elif celery_state == "REVOKED":
+        job_status = "cancelled"
+    else:
+        job_status = "pending"
+
+    progress_percentage = 0
+    if progress_data:
+        progress_obj = json_loads(progress_data)
+        progress_percentage = progress_obj.get("progress_percentage", 0)
+
+    # Request info lives in the metadata; only older jobs need the request blob
+    dataset = "Unknown Dataset"
+    algorithm = "InSilicoVA"
+    age_group = metadata.get("age_group")
+    country = metadata.get("country")
+    if age_group is None:
+        request_obj = load_job_request(job_id)
+        if request_obj:
+            dataset = request_obj.get("dataset", dataset)
+            algorithm = request_obj.get("algorithm", algorithm)
+            age_group = request_obj.get("age_group")
+            country = request_obj.get("country")
+
+    # Build job object
+    job_obj = {
+        "job_id": job_id,
+        "status": job_status,
+        "progress": progress_percentage,
+        "created_at": metadata.get("created_at"),
+        "completed_at": metadata.get("completed_at"),
+        "algorithm": algorithm,
+        "dataset": dataset,
+        "age_group": age_group,
+        "country": country
+    }
+
+    # Add error if failed
+    if job_status == "failed":
+        # Only failed jobs need the task's exception from the result backend
+        celery_result = AsyncResult(job_id, app=celery_app)
+        if celery_result.failed():
+            job_obj["error"] = str(celery_result.result) if celery_result.result else "Job failed"
+
+    return job_obj
+
+
 async def list_celery_jobs_simple(limit: int = 50, status: Optional[str] = None) -> Dict[str, Any]:
     """List Celery jobs in simple format for frontend"""
 
@@ -803,73 +1356,25 @@ async def list_celery_jobs_simple(limit: int = 50, status: Optional[str] = None)
     job_keys = redis_client.keys("job_metadata:*")
     all_jobs = []
 
+    # Every job's metadata and progress in one round trip, then every Celery state in another
+    pipe = redis_client.pipeline(transaction=False)
     for key in job_keys:
-        metadata_data = redis_client.get(key)
-        if not metadata_data:
-            continue
-
+        pipe.get(key)
+        pipe.get(f"job_progress:{key.split(':', 1)[1]}")
+    blobs = pipe.execute()
+    found = [(key.split(':', 1)[1], metadata_data, progress_data)
+             for key, metadata_data, progress_data in zip(job_keys, blobs[::2], blobs[1::2])
+             if metadata_data]
+    celery_states = get_celery_states([job_id for job_id, _, _ in found]) if found else []
+
+    for (job_id, metadata_data, progress_data), celery_state in zip(found, celery_states):
         try:
-            metadata = json.loads(metadata_data)
-            job_id = metadata.get("job_id")
-
-            # Get Celery task status
-            celery_result = AsyncResult(job_id, app=celery_app)
-
-            # Map Celery status to our status
-            if celery_result.state == "PENDING":
-                job_status = "pending"
-            elif celery_result.state == "STARTED":
-                job_status = "running"
-            elif celery_result.state == "SUCCESS":
-                job_status = "completed"
-            elif celery_result.state == "FAILURE":
-                job_status = "failed"
-            elif celery_result.state == "REVOKED":
-                job_status = "cancelled"
-            else:
-                job_status = "pending"
+            job_obj = _simple_job_entry(json_loads(metadata_data), progress_data, celery_state)
 
             # Apply status filter if provided
-            if status and job_status != status:
+            if status and job_obj["status"] != status:
                 continue
 
-            # Get progress
-            progress_data = redis_client.get(f"job_progress:{job_id}")
-            progress_percentage = 0
-            if progress_data:
-                progress_obj = json.loads(progress_data)
-                progress_percentage = progress_obj.get("progress_percentage", 0)
-
-            # Get request data for additional info
-            request_data = redis_client.get(f"job_request:{job_id}")
-            dataset = None
-            algorithm = None
-            age_group = None
-            country = None
-            if request_data:
-                request_obj = json.loads(request_data)
-                dataset = request_obj.get("dataset", "Unknown Dataset")
-                algorithm = request_obj.get("algorithm", "InSilicoVA")
-                age_group = request_obj.get("age_group")
-                country = request_obj.get("country")
-
-            # Build job object
-            job_obj = {
-                "job_id": job_id,
-                "status": job_status,
-                "progress": progress_percentage,
-                "created_at": metadata.get("created_at"),
-                "completed_at": metadata.get("completed_at"),
-                "algorithm": algorithm,
-                "dataset": dataset,
-                "age_group": age_group,
-                "country": country
-            }
-
-            # Add error if failed
-            if job_status == "failed" and celery_result.failed():
-                job_obj["error"] = str(celery_result.result) if celery_result.result else "Job failed"
-
             all_jobs.append(job_obj)
 
         except Exception as e:
@@ -884,12 +1389,90 @@ async def list_celery_jobs_simple(limit: int = 50, status: Optional[str] = None)
     return {"jobs": limited_jobs, "total": len(limited_jobs)}
 
 
-async def cancel_job(job_id: str) -> Dict[str, str]:
+async def list_user_jobs(
+    user_id: str,
+    limit: int = 50,
+    offset: int = 0,
+    status: Optional[str] = None
+) -> Dict[str, Any]:
+    """List one user's jobs, newest first, from their user:{id}:jobs index.
+
+    Reads only the requested page: ZCARD and ZREVRANGE in one round trip, then the
+    page's metadata and progress in a second and its Celery states in a third,
+    instead of walking every job in Redis.
+    ``status`` filters the page itself, so a filtered page may hold fewer than ``limit``
+    jobs; ``total`` counts all of the user's jobs. Jobs created before the index
+    existed are picked up by backfill_user_job_index the first time it is empty.
+    """
+    index_key = user_jobs_key(user_id)
+
+    def read_page():
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zcard(index_key)
+        # A stop index of -1 would mean "to the end", so an empty page asks for nothing
+        if limit > 0:
+            pipe.zrevrange(index_key, offset, offset + limit - 1)
+        total, *page = pipe.execute()
+        return total, page[0] if page else []
+
+    total, job_ids = read_page()
+    # An empty index may just predate indexing; backfill it once and re-read
+    if not total and backfill_user_job_index(user_id):
+        total, job_ids = read_page()
+
+    pipe = redis_client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.get(f"job_metadata:{job_id}")
+        pipe.get(f"job_progress:{job_id}")
+    blobs = pipe.execute()
+
+    # The page's Celery states in one result-backend read, not one per job
+    live = [job_id for job_id, metadata_data in zip(job_ids, blobs[::2]) if metadata_data]
+    celery_states = dict(zip(live, get_celery_states(live))) if live else {}
+
+    jobs = []
+    expired = []
+    for job_id, metadata_data, progress_data in zip(job_ids, blobs[::2], blobs[1::2]):
+        if not metadata_data:
+            # Metadata has expired; drop the stale index entry
+            expired.append(job_id)
+            continue
+        try:
+            job_obj = _simple_job_entry(json_loads(metadata_data), progress_data, celery_states[job_id])
+        except Exception:
+            continue  # Skip malformed metadata
+        if status and job_obj["status"] != status:
+            continue
+        jobs.append(job_obj)
+
+    if expired:
+        redis_client.zrem(index_key, *expired)
+        total -= len(expired)
+
+    return {"jobs": jobs, "total": total, "limit": limit, "offset": offset}
+
+
+async def cancel_job(job_id: str, user_id: Optional[str] = None) -> Dict[str, str]:
     """Cancel a running job"""
 
-    # Check if job exists
-    metadata = get_job_metadata(job_id)
-    if not metadata:
+    # Enforce ownership for authenticated callers
+    if user_id is not None:
+        check_job_owner(job_id, user_id)
+
+    # Mark the job cancelled unless it has already finished
+    cancelled_at = datetime.utcnow()
+    try:
+        found = job_cancel(
+            keys=[f"job_metadata:{job_id}", job_events_channel(job_id), job_version_key(job_id)],
+            args=[cancelled_at.isoformat(), CACHE_TTL * 24],
+            client=redis_client
+        )
+    except redis.exceptions.ResponseError as e:
+        if "FINISHED" in str(e):
+            raise HTTPException(status_code=400, detail=f"Job {job_id} has already finished and cannot be cancelled")
+        raise
+
+    if not found:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
     # Revoke Celery task
@@ -898,35 +1481,31 @@ async def cancel_job(job_id: str) -> Dict[str, str]:
     # Log cancellation
     log_job_event(job_id, LogLevel.WARNING, "Job cancelled by user", "api")
 
-    # Update metadata
-    metadata.completed_at = datetime.utcnow()
-    store_job_metadata(job_id, metadata)
+    return {"job_id": job_id, "status": "cancelled", "cancelled_at": cancelled_at.isoformat()}
 
-    return {"job_id": job_id, "status": "cancelled"}
 
-
-async def get_job_result(job_id: str) -> JobResultResponse:
+async def get_job_result(job_id: str, user_id: Optional[str] = None) -> JobResultResponse:
     """Get final results for a completed job"""
 
+    # Enforce ownership for authenticated callers
+    if user_id is not None:
+        check_job_owner(job_id, user_id)
+
     # Check if job exists
     metadata = get_job_metadata(job_id)
     if not metadata:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-    # Get Celery task status
-    celery_result = AsyncResult(job_id, app=celery_app)
-    status = _map_celery_status(celery_result.state)
+    status = _resolve_job_status(metadata)
 
     if status not in [JobStatus.SUCCESS, JobStatus.FAILED]:
         raise HTTPException(status_code=400, detail=f"Job {job_id} is not completed (status: {status})")
 
     # Get result data
-    result_data = redis_client.get(f"job_result:{job_id}")
-    if not result_data:
+    result = load_job_result(job_id)
+    if result is None:
         raise HTTPException(status_code=404, detail=f"Results not found for job {job_id}")
 
-    result = json.loads(result_data)
-
     # Check for cache info
     cache_info = result.get("cache_info")
 
@@ -939,6 +1518,60 @@ async def get_job_result(job_id: str) -> JobResultResponse:
     )
 
 
+def get_celery_states(job_ids: List[str]) -> List[str]:
+    """Celery task states for job_ids, read from the result backend in one round trip.
+
+    Key-value backends (Redis, Memcached, ...) keep one meta entry per task, so all
+    of them are fetched with a single MGET; a task with no entry yet is PENDING.
+    Other backends are asked one task at a time.
+    """
+    backend = celery_app.backend
+    if isinstance(backend, BaseKeyValueStoreBackend):
+        try:
+            values = backend.mget([backend.get_key_for_task(job_id) for job_id in job_ids])
+        except NotImplementedError:
+            pass
+        else:
+            return [backend.decode_result(value)["status"] if value else "PENDING" for value in values]
+    return [AsyncResult(job_id, app=celery_app).state for job_id in job_ids]
+
+
+async def get_jobs_status_batch(job_ids: List[str], user_id: Optional[str] = None) -> JobStatusBatchResponse:
+    """Report status and progress for several jobs with one Redis pipeline and one backend read.
+
+    Jobs that don't exist, or belong to a user other than user_id, are returned
+    with found=False rather than failing the whole poll.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.get(f"job_metadata:{job_id}")
+        pipe.get(f"job_progress:{job_id}")
+    blobs = pipe.execute()
+
+    metadatas = [JobMetadata.model_validate_json(data) if data else None for data in blobs[::2]]
+
+    # Only jobs without a recorded final status need the result backend
+    in_flight = [job_id for job_id, metadata in zip(job_ids, metadatas) if metadata and metadata.status is None]
+    celery_states = dict(zip(in_flight, get_celery_states(in_flight))) if in_flight else {}
+
+    jobs = []
+    for job_id, metadata, progress_data in zip(job_ids, metadatas, blobs[1::2]):
+        if metadata is None or (user_id is not None and metadata.user_id not in (None, user_id)):
+            jobs.append(JobStatusSummary(job_id=job_id, found=False))
+            continue
+
+        jobs.append(JobStatusSummary(
+            job_id=job_id,
+            found=True,
+            status=metadata.status or _map_celery_status(celery_states[job_id]),
+            progress=JobProgress.model_validate_json(progress_data) if progress_data else None,
+            created_at=metadata.created_at,
+            completed_at=metadata.completed_at
+        ))
+
+    return JobStatusBatchResponse(jobs=jobs)
+
+
 async def get_batch_status(batch_id: str) -> BatchStatusResponse:
     """Get status of batch job processing"""
 
@@ -947,14 +1580,14 @@ async def get_batch_status(batch_id: str) -> BatchStatusResponse:
     if not batch_data:
         raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
 
-    batch_metadata = json.loads(batch_data)
+    batch_metadata = json_loads(batch_data)
 
     # Get job IDs
     job_ids_data = redis_client.get(f"batch_jobs:{batch_id}")
     if not job_ids_data:
         raise HTTPException(status_code=404, detail=f"Batch jobs not found for {batch_id}")
 
-    job_ids = json.loads(job_ids_data)
+    job_ids = json_loads(job_ids_data)
 
     # Check status of each job
     job_statuses = []
@@ -963,9 +1596,13 @@ async def get_batch_status(batch_id: str) -> BatchStatusResponse:
     running_jobs = 0
     pending_jobs = 0
 
-    for job_id in job_ids:
-        celery_result = AsyncResult(job_id, app=celery_app)
-        status = _map_celery_status(celery_result.state)
+    # Every job's metadata in one round trip; only jobs still in flight need Celery
+    metadata_blobs = redis_client.mget([f"job_metadata:{job_id}" for job_id in job_ids]) if job_ids else []
+    for job_id, metadata_data in zip(job_ids, metadata_blobs):
+        if metadata_data:
+            status = _resolve_job_status(JobMetadata.model_validate_json(metadata_data))
+        else:
+            status = _map_celery_status(AsyncResult(job_id, app=celery_app).state)
 
         job_statuses.append({
             "job_id": job_id,
@@ -978,8 +1615,9 @@ async def get_batch_status(batch_id: str) -> BatchStatusResponse:
             failed_jobs += 1
         elif status == JobStatus.RUNNING:
             running_jobs += 1
-        else:
+        elif status == JobStatus.PENDING:
             pending_jobs += 1
+        # Cancelled and timed-out jobs count towards no bucket; the batch ends up partial
 
     # Determine overall batch status
     if completed_jobs == len(job_ids):
@@ -1028,9 +1666,10 @@ async def get_cache_statistics() -> CacheStats:
         if cached_data:
             total_size_bytes += len(cached_data.encode('utf-8'))
             try:
-                cache_obj = json.loads(cached_data)
-                if "cached_at" in cache_obj:
-                    timestamps.append(datetime.fromisoformat(cache_obj["cached_at"]))
+                cache_obj = json_loads(cached_data)
+                cached_ms = cached_at_ms(cache_obj)
+                if cached_ms is not None:
+                    timestamps.append(cached_ms)
             except:
                 continue
 
@@ -1039,8 +1678,9 @@ async def get_cache_statistics() -> CacheStats:
     # Get cache hit statistics (simplified - would need more tracking in production)
     cache_hit_rate = 0.0  # Would track this with additional counters
 
-    oldest_result = min(timestamps) if timestamps else None
-    newest_result = max(timestamps) if timestamps else None
+    # Only the two reported timestamps are converted back to datetimes
+    oldest_result = ms_to_datetime(min(timestamps)) if timestamps else None
+    newest_result = ms_to_datetime(max(timestamps)) if timestamps else None
 
     return CacheStats(
         total_cached_results=total_cached,
@@ -1088,9 +1728,24 @@ def _map_celery_status(celery_state: str) -> JobStatus:
     return mapping.get(celery_state, JobStatus.PENDING)
 
 
-async def delete_job(job_id: str) -> Dict[str, str]:
+def _resolve_job_status(metadata: JobMetadata) -> JobStatus:
+    """The job's status: the final one recorded in its metadata, else its Celery state.
+
+    The worker returns normally on failure (Celery reports SUCCESS) and a job
+    cancelled before it ran can stay PENDING, so the metadata must win.
+    """
+    if metadata.status is not None:
+        return metadata.status
+    return _map_celery_status(AsyncResult(metadata.job_id, app=celery_app).state)
+
+
+async def delete_job(job_id: str, user_id: Optional[str] = None) -> Dict[str, str]:
     """Delete a job and all its associated data from Redis"""
 
+    # Enforce ownership for authenticated callers
+    if user_id is not None:
+        check_job_owner(job_id, user_id)
+
     # Check if job exists
     metadata = get_job_metadata(job_id)
     if not metadata:
@@ -1107,15 +1762,20 @@ async def delete_job(job_id: str) -> Dict[str, str]:
         f"job_request:{job_id}",
         f"job_progress:{job_id}",
         f"job_logs:{job_id}",
-        f"job_result:{job_id}"
+        f"job_result:{job_id}",
+        f"job_result_summary:{job_id}",
+        job_version_key(job_id)
     ]
 
-    deleted_count = 0
-    for key in keys_to_delete:
-        if redis_client.delete(key):
-            deleted_count += 1
+    # One DEL for all keys (it returns how many existed), plus the index entry
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(*keys_to_delete)
+    if metadata.user_id is not None:
+        pipe.zrem(user_jobs_key(metadata.user_id), job_id)
+    deleted_count = pipe.execute()[0]
 
-    log_job_event(job_id, LogLevel.INFO, "Job deleted by user", "api")
+    # Not log_job_event: that would recreate job_logs and job_version for the deleted job
+    logger.info(f"Job {job_id} deleted by user")
 
     return {
         "job_id": job_id,
@@ -1124,8 +1784,12 @@ async def delete_job(job_id: str) -> Dict[str, str]:
     }
 
 
-async def delete_all_jobs(status_filter: Optional[JobStatus] = None, age_group_filter: Optional[AgeGroup] = None) -> Dict[str, Any]:
-    """Delete multiple jobs based on filters"""
+async def delete_all_jobs(
+    status_filter: Optional[JobStatus] = None,
+    age_group_filter: Optional[AgeGroup] = None,
+    user_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Delete multiple jobs based on filters (only user_id's own jobs, if given)"""
 
     # Get all job metadata keys
     job_keys = redis_client.keys("job_metadata:*")
@@ -1142,20 +1806,15 @@ async def delete_all_jobs(status_filter: Optional[JobStatus] = None, age_group_f
             job_id = metadata.job_id
 
             # Apply filters
-            should_delete = True
+            should_delete = user_id is None or metadata.user_id == user_id
 
             if status_filter:
-                celery_result = AsyncResult(job_id, app=celery_app)
-                job_status = _map_celery_status(celery_result.state)
-                if job_status != status_filter:
+                if _resolve_job_status(metadata) != status_filter:
                     should_delete = False
 
             if age_group_filter:
-                request_data = redis_client.get(f"job_request:{job_id}")
-                if request_data:
-                    request_obj = json.loads(request_data)
-                    if request_obj.get("age_group") != age_group_filter.value:
-                        should_delete = False
+                if get_job_request_fields(metadata)["age_group"] != age_group_filter.value:
+                    should_delete = False
 
             if should_delete:
                 try:
@@ -1175,6 +1834,36 @@ async def delete_all_jobs(status_filter: Optional[JobStatus] = None, age_group_f
     }
 
 
+async def cleanup_expired_jobs(retention_days: int, key_index: Optional[set] = None) -> int:
+    """Delete jobs that finished (or were created) more than retention_days ago.
+
+    ``key_index`` is an optional set of candidate ``job_metadata:*`` keys; when
+    given, the keyspace scan is skipped and only those keys are inspected.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    job_keys = key_index if key_index is not None else redis_client.scan_iter(match="job_metadata:*", count=1000)
+    cleaned_count = 0
+
+    for key in job_keys:
+        metadata_data = redis_client.get(key)
+        if not metadata_data:
+            continue
+
+        try:
+            metadata = JobMetadata.model_validate_json(metadata_data)
+        except Exception:
+            continue
+
+        finished_at = metadata.completed_at or metadata.created_at
+        if finished_at.replace(tzinfo=None) < cutoff:
+            try:
+                await delete_job(metadata.job_id)
+                cleaned_count += 1
+            except Exception as e:
+                logger.warning(f"Failed to clean up job {metadata.job_id}: {e}")
+
+    return cleaned_count
+
 # FastAPI router setup would go here - these functions would be decorated with @router.get, @router.post, etc.
 # Example:
 # from fastapi import APIRouter
@@ -4,7 +4,7 @@ VA-Calibration API - Direct execution version
 Runs calibration immediately without job storage
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Optional, Union, Any
@@ -19,10 +19,15 @@ import os
 from .job_endpoints import (
     create_calibration_job as celery_create_job,
     list_celery_jobs_simple,
+    list_user_jobs,
     get_job_status as celery_get_job_status,
+    render_job_status,
+    get_jobs_status_batch,
     cancel_job as celery_cancel_job,
     delete_job as celery_delete_job,
-    CalibrationJobRequest
+    CalibrationJobRequest,
+    JobStatusBatchRequest,
+    JobStatusBatchResponse
 )
 
 # Import WebSocket components
@@ -33,9 +38,10 @@ from .websocket_handler import (
 from .calibration_service import (
     get_calibration_service
 )
-from .security import setup_security
+from .security import setup_security, get_current_user_id
 from .validation import (
     validate_va_data, ValidationError as CustomValidationError,
+    COUNTRY_PATTERN, MAX_COUNTRY_LENGTH,
     EnhancedValidationMiddleware
 )
 
@@ -214,7 +220,9 @@ class CalibrationRequest(BaseModel):
     )
     country: str = Field(
         default="Mozambique",
-        description="Country for calibration"
+        description="Country for calibration",
+        max_length=MAX_COUNTRY_LENGTH,
+        pattern=COUNTRY_PATTERN
     )
     mmat_type: str = Field(
         default="prior",
@@ -270,6 +278,11 @@ class CalibrationRequest(BaseModel):
     }
 
 
+def _run_r(cmd: List[str]) -> subprocess.CompletedProcess:
+    """Run an Rscript command from the API's working directory, capturing text output"""
+    return subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+
+
 def check_r_setup():
     """Check if R and required packages are available"""
     try:
@@ -283,7 +296,7 @@ def check_r_setup():
             "Rscript", "-e",
             "if(!require(vacalibration, quietly=TRUE)) stop('vacalibration not found'); if(!require(jsonlite, quietly=TRUE)) stop('jsonlite not found')"
         ]
-        result = subprocess.run(check_cmd, capture_output=True, text=True)
+        result = _run_r(check_cmd)
         if result.returncode != 0:
             return False, f"Missing R packages: {result.stderr}"
 
@@ -292,6 +305,14 @@ def check_r_setup():
         return False, str(e)
 
 
+def _load_r_output(path: str) -> Optional[Dict]:
+    """Read the JSON file an R script wrote, or None if it produced no output"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
 @app.get("/")
 async def root():
     """Health check"""
@@ -457,13 +478,9 @@ async def debug_test_job():
     return results
 
 
-@app.post("/calibrate")
-async def calibrate(request: CalibrationRequest):
-    """Run calibration directly or asynchronously based on async parameter"""
-
-    # Apply enhanced validation
+def validate_request_va_data(request_data: Dict[str, Any]) -> None:
+    """Validate request_data's va_data in place, raising 422 on invalid data"""
     try:
-        request_data = request.model_dump()
         # Determine data format if not specified
         data_format = 'specific_causes'  # default
         if request_data.get('va_data'):
@@ -495,6 +512,15 @@ async def calibrate(request: CalibrationRequest):
             }
         )
 
+
+@app.post("/calibrate")
+async def calibrate(request: CalibrationRequest):
+    """Run calibration directly or asynchronously based on async parameter"""
+
+    # Apply enhanced validation
+    request_data = request.model_dump()
+    validate_request_va_data(request_data)
+
     # Check if async mode is requested
     if request.async_:
         # Use calibration service for async execution
@@ -533,10 +559,19 @@ async def calibrate(request: CalibrationRequest):
 
 # Async calibration endpoints (Celery-based with background workers)
 @app.post("/jobs/calibrate")
-async def create_calibration_job_endpoint(request: CalibrationJobRequest, background_tasks: BackgroundTasks):
+async def create_calibration_job_endpoint(
+    request: CalibrationJobRequest,
+    background_tasks: BackgroundTasks,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """Create a new Celery-based calibration job with background workers"""
+    # Same VA data checks as /calibrate; the job stores the request as submitted
+    validate_request_va_data(request.model_dump(mode="json"))
+
     try:
-        return await celery_create_job(request, background_tasks)
+        return await celery_create_job(request, background_tasks, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_detail = {
@@ -548,30 +583,53 @@ async def create_calibration_job_endpoint(request: CalibrationJobRequest, backgr
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+@app.post("/jobs/status", response_model=JobStatusBatchResponse)
+async def get_calibration_jobs_status(
+    request: JobStatusBatchRequest,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
+    """Get status and progress of several jobs in one call (instead of polling each)"""
+    return await get_jobs_status_batch(request.job_ids, user_id=user_id)
+
+
 @app.get("/jobs/{job_id}")
-async def get_calibration_job_status(job_id: str):
+async def get_calibration_job_status(
+    job_id: str,
+    include_result: bool = Query(False, description="Include the full calibration result once the job succeeds"),
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job's next progress or state change"),
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """Get status and results of a calibration job"""
-    return await celery_get_job_status(job_id)
+    # Serialized in pydantic-core directly; the default jsonable_encoder pass walks the
+    # whole (possibly large) result in Python first
+    content = await render_job_status(job_id, user_id=user_id, include_result=include_result, wait=wait)
+    return Response(content=content, media_type="application/json")
 
 
 @app.get("/jobs")
 async def list_jobs(
     limit: int = Query(50, description="Maximum number of jobs to return"),
-    status: Optional[str] = Query(None, description="Filter by job status")
+    offset: int = Query(0, ge=0, description="Number of jobs to skip (authenticated callers)"),
+    status: Optional[str] = Query(None, description="Filter by job status"),
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """List calibration jobs with optional filtering"""
+    if user_id is not None:
+        # Authenticated callers page through their own job index
+        return await list_user_jobs(user_id, limit=limit, offset=offset, status=status)
     return await list_celery_jobs_simple(limit=limit, status=status)
 
 
 @app.get("/jobs/{job_id}/output")
 async def get_calibration_job_output(
     job_id: str,
-    start_line: int = Query(0, description="Starting line number for output")
+    start_line: int = Query(0, description="Starting line number for output"),
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """Get R script output for streaming (useful for progress monitoring)"""
     # Note: Output streaming not yet implemented in Celery version
     # Return logs from job status instead
-    status = await celery_get_job_status(job_id, log_limit=100, log_offset=start_line)
+    status = await celery_get_job_status(job_id, log_limit=100, log_offset=start_line, user_id=user_id)
     return {
         "job_id": job_id,
         "logs": [log.message for log in status.logs],
@@ -580,15 +638,15 @@ async def get_calibration_job_output(
 
 
 @app.post("/jobs/{job_id}/cancel")
-async def cancel_calibration_job(job_id: str):
+async def cancel_calibration_job(job_id: str, user_id: Optional[str] = Depends(get_current_user_id)):
     """Cancel a running calibration job"""
-    return await celery_cancel_job(job_id)
+    return await celery_cancel_job(job_id, user_id=user_id)
 
 
 @app.delete("/jobs/{job_id}")
-async def delete_job(job_id: str):
+async def delete_job(job_id: str, user_id: Optional[str] = Depends(get_current_user_id)):
     """Delete a calibration job"""
-    return await celery_delete_job(job_id)
+    return await celery_delete_job(job_id, user_id=user_id)
 
 
 # WebSocket-enhanced calibration endpoints
@@ -773,13 +831,11 @@ async def get_cause_mappings(age_group: AgeGroup):
 
         # Run R script
         cmd = ["Rscript", r_script_file, age_group.value, output_file]
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+        result = _run_r(cmd)
 
         # Check for output
-        if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                mapping_data = json.load(f)
-
+        mapping_data = _load_r_output(output_file)
+        if mapping_data is not None:
             if mapping_data.get("success"):
                 mappings = []
                 for mapping in mapping_data.get("mappings", []):
@@ -847,13 +903,11 @@ async def preview_dataset(dataset_id: str, limit: int = 10):
 
         # Run R script
         cmd = ["Rscript", r_script_file, dataset_id, str(limit), output_file]
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+        result = _run_r(cmd)
 
         # Check for output
-        if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                preview_data = json.load(f)
-
+        preview_data = _load_r_output(output_file)
+        if preview_data is not None:
             if preview_data.get("success"):
                 return DatasetPreviewResponse(
                     dataset_id=dataset_id,
@@ -906,13 +960,11 @@ async def convert_causes(request: ConvertCausesRequest):
 
         # Run R script
         cmd = ["Rscript", r_script_file, input_file, output_file]
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+        result = _run_r(cmd)
 
         # Check for output
-        if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                output_data = json.load(f)
-
+        output_data = _load_r_output(output_file)
+        if output_data is not None:
             if output_data.get("success"):
                 return ConvertCausesResponse(
                     converted_data=output_data.get("converted_data", []),
@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 from typing import Optional, List
 from datetime import datetime
 
+from .security import get_current_user_id
 from .job_endpoints import (
     # Request/Response Models
     CalibrationJobRequest,
@@ -60,7 +61,8 @@ async def get_calibration_status(
     job_id: str,
     log_level: Optional[LogLevel] = Query(None, description="Filter logs by level"),
     log_limit: int = Query(100, description="Maximum number of log entries to return", ge=1, le=1000),
-    log_offset: int = Query(0, description="Number of log entries to skip for pagination", ge=0)
+    log_offset: int = Query(0, description="Number of log entries to skip for pagination", ge=0),
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """
     Get detailed status information for a calibration job.
@@ -75,7 +77,9 @@ async def get_calibration_status(
     **Log Levels:** debug, info, warning, error, critical
     """
     try:
-        return await get_job_status(job_id, log_level, log_limit, log_offset)
+        return await get_job_status(job_id, log_level, log_limit, log_offset, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -90,7 +94,8 @@ async def get_calibration_status(
 )
 async def create_async_calibration(
     request: CalibrationJobRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """
     Create a new asynchronous calibration job.
@@ -105,7 +110,9 @@ async def create_async_calibration(
     **Returns:** Job ID and creation status
     """
     try:
-        return await create_calibration_job(request, background_tasks)
+        return await create_calibration_job(request, background_tasks, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create job: {str(e)}")
 
@@ -117,7 +124,10 @@ async def create_async_calibration(
     summary="Create Batch Calibration Jobs",
     description="Process multiple calibration requests in parallel with intelligent load balancing"
 )
-async def create_batch_calibration(request: BatchCalibrationRequest):
+async def create_batch_calibration(
+    request: BatchCalibrationRequest,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """
     Create and process multiple calibration jobs in parallel.
 
@@ -134,7 +144,9 @@ async def create_batch_calibration(request: BatchCalibrationRequest):
     - Intelligent queuing and load balancing
     """
     try:
-        return await create_batch_jobs(request)
+        return await create_batch_jobs(request, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create batch: {str(e)}")
 
@@ -216,7 +228,10 @@ async def list_calibration_jobs(
     summary="Cancel Job",
     description="Cancel a running calibration job and clean up resources"
 )
-async def cancel_calibration_job(job_id: str):
+async def cancel_calibration_job(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """
     Cancel a running calibration job.
 
@@ -229,7 +244,9 @@ async def cancel_calibration_job(job_id: str):
     **Note:** Cancelled jobs cannot be resumed
     """
     try:
-        return await cancel_job(job_id)
+        return await cancel_job(job_id, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -242,7 +259,10 @@ async def cancel_calibration_job(job_id: str):
     summary="Get Job Results",
     description="Retrieve final calibration results for completed jobs"
 )
-async def get_calibration_result(job_id: str):
+async def get_calibration_result(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """
     Get final calibration results for a completed job.
 
@@ -256,7 +276,9 @@ async def get_calibration_result(job_id: str):
     **Requirements:** Job must be in SUCCESS or FAILED status
     """
     try:
-        return await get_job_result(job_id)
+        return await get_job_result(job_id, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=f"Job or results not found for {job_id}")
@@ -470,7 +492,10 @@ async def retry_failed_job(
     summary="Delete Job",
     description="Delete a job and all its associated data from Redis"
 )
-async def delete_job_endpoint(job_id: str):
+async def delete_job_endpoint(
+    job_id: str,
+    user_id: Optional[str] = Depends(get_current_user_id)
+):
     """
     Delete a job and all its associated data.
 
@@ -482,7 +507,9 @@ async def delete_job_endpoint(job_id: str):
     **Warning:** This action permanently deletes the job
     """
     try:
-        return await delete_job(job_id)
+        return await delete_job(job_id, user_id=user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -497,7 +524,8 @@ async def delete_job_endpoint(job_id: str):
 async def delete_all_jobs_endpoint(
     status: Optional[JobStatus] = Query(None, description="Filter by job status"),
     age_group: Optional[AgeGroup] = Query(None, description="Filter by age group"),
-    confirm: bool = Query(False, description="Confirmation flag required for deletion")
+    confirm: bool = Query(False, description="Confirmation flag required for deletion"),
+    user_id: Optional[str] = Depends(get_current_user_id)
 ):
     """
     Delete all jobs matching the specified filters.
@@ -506,6 +534,7 @@ async def delete_all_jobs_endpoint(
     - Optional filtering by status and age group
     - Bulk deletion with progress tracking
     - Confirmation requirement for safety
+    - Authenticated callers only delete their own jobs
 
     **Warning:** This action cannot be undone
     """
@@ -516,7 +545,7 @@ async def delete_all_jobs_endpoint(
         )
 
     try:
-        return await delete_all_jobs(status, age_group)
+        return await delete_all_jobs(status, age_group, user_id=user_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete jobs: {str(e)}")
 
@@ -3,6 +3,7 @@ Security middleware for API authentication and authorization
 """
 
 import os
+from contextvars import ContextVar
 from typing import Optional, List
 from fastapi import Request, HTTPException, Depends, Security
 from fastapi.security import APIKeyHeader, APIKeyQuery
@@ -31,6 +32,9 @@ if not VALID_API_KEYS:
         VALID_API_KEYS = ["dev-test-key-123"]
         logger.warning("Using default development API key. Set API_KEYS environment variable in production!")
 
+# Id of the authenticated caller for the current request
+current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
+
 # Header and query parameter extractors
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 api_key_query = APIKeyQuery(name=API_KEY_QUERY_NAME, auto_error=False)
@@ -80,6 +84,29 @@ def is_valid_api_key(api_key: str) -> bool:
     return False
 
 
+def user_id_for_api_key(api_key: str) -> str:
+    """
+    Derive a stable, non-reversible user id from an API key
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def get_current_user_id(request: Request) -> Optional[str]:
+    """
+    Identify the caller for job ownership checks
+    Read from the context variable set once per request by APIKeyMiddleware;
+    None when auth is disabled
+    """
+    user_id = current_user_id.get()
+    if user_id is not None:
+        return user_id
+
+    api_key = getattr(request.state, "api_key", None)
+    if not api_key:
+        return None
+    return user_id_for_api_key(api_key)
+
+
 class APIKeyMiddleware(BaseHTTPMiddleware):
     """
     Middleware for API key authentication on all endpoints
@@ -134,8 +161,12 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         # Store API key in request state for logging/auditing
         request.state.api_key = api_key
 
-        # Continue with request
-        response = await call_next(request)
+        # Resolve the caller once; downstream dependencies read the context variable
+        token = current_user_id.set(user_id_for_api_key(api_key))
+        try:
+            response = await call_next(request)
+        finally:
+            current_user_id.reset(token)
         return response
 
 
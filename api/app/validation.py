@@ -43,12 +43,18 @@ MAX_DEATHS_PER_REQUEST = 10000
 MAX_BATCH_JOBS = 20
 MAX_CAUSE_NAME_LENGTH = 100
 MAX_ID_LENGTH = 50
+MAX_COUNTRY_LENGTH = 64
 
 # Patterns for validation
 ID_PATTERN = re.compile(r'^[a-zA-Z0-9_\-]+$')
+# Country names: letters, spaces and hyphens (enforced by request models in pydantic-core)
+COUNTRY_PATTERN = r'^[A-Za-z \-]+$'
 # Allow Latin letters (including accented), numbers, spaces, and common punctuation
 # Explicitly list allowed characters to exclude Chinese/Arabic/etc.
 CAUSE_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_/(),.áéíóúñÁÉÍÓÚÑàèìòùÀÈÌÒÙäëïöüÄËÏÖÜâêîôûÂÊÎÔÛçÇãÃõÕ]+$')
+# SQL keywords rejected in cause names, matched in a single case-insensitive pass
+SQL_INJECTION_PATTERN = re.compile(r'DROP|DELETE|INSERT|UPDATE|SELECT', re.IGNORECASE)
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
 
 
 class ValidationError(Exception):
@@ -81,7 +87,7 @@ def validate_cause_name(cause: str, age_group: str, strict: bool = False) -> boo
         )
 
     # Check for SQL injection patterns first (before format check)
-    if any(keyword in cause.upper() for keyword in ['DROP', 'DELETE', 'INSERT', 'UPDATE', 'SELECT']):
+    if SQL_INJECTION_PATTERN.search(cause):
         raise ValidationError(
             "Potential SQL injection detected in cause name",
             field="cause",
@@ -412,7 +418,7 @@ def sanitize_input(value: str) -> str:
         Sanitized string
     """
     # Remove any HTML/script tags
-    value = re.sub(r'<[^>]*>', '', value)
+    value = HTML_TAG_PATTERN.sub('', value)
 
     # Escape special characters
     value = value.replace("'", "''")  # SQL escape
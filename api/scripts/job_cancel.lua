@@ -0,0 +1,26 @@
+-- Cancel a calibration job in a single round trip, unless it has already finished.
+-- KEYS[1]: job_metadata:{job_id}
+-- KEYS[2]: job:{job_id}:events
+-- KEYS[3]: job_version:{job_id}
+-- ARGV[1]: cancellation time (ISO 8601), recorded as completed_at with status 'cancelled'
+-- ARGV[2]: TTL in seconds for the version counter
+-- Returns 0 if the job does not exist, 1 if it was cancelled and a
+-- FINISHED error if it had already completed, failed or been cancelled.
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return 0
+end
+
+local metadata = cjson.decode(raw)
+local completed_at = metadata['completed_at']
+if completed_at ~= nil and completed_at ~= cjson.null then
+    return redis.error_reply('FINISHED')
+end
+
+metadata['completed_at'] = ARGV[1]
+metadata['status'] = 'cancelled'
+redis.call('SET', KEYS[1], cjson.encode(metadata), 'KEEPTTL')
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[2])
+redis.call('PUBLISH', KEYS[2], 'cancelled')
+return 1
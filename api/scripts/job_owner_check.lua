@@ -0,0 +1,16 @@
+-- Authorize access to a calibration job in a single round trip.
+-- KEYS[1]: job_metadata:{job_id}
+-- ARGV[1]: id of the requesting user
+-- Returns 0 if the job does not exist, 1 if access is allowed and a
+-- FORBIDDEN error if the job belongs to another user.
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return 0
+end
+
+local owner = cjson.decode(raw)['user_id']
+if owner == nil or owner == cjson.null or owner == ARGV[1] then
+    return 1
+end
+
+return redis.error_reply('FORBIDDEN')
@@ -0,0 +1,31 @@
+-- Token bucket rate limiter, evaluated atomically in a single round trip.
+-- KEYS[1]: bucket:{user_id}
+-- ARGV[1]: bucket capacity
+-- ARGV[2]: refill rate in tokens per second
+-- ARGV[3]: current time in seconds
+-- ARGV[4]: tokens to take (one per job being created)
+-- Returns {1, 0} if the tokens were taken, or {0, ms} if the request must be
+-- rejected, where ms is how long until the bucket refills enough to allow it.
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4]) or 1
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+local tokens = tonumber(state[1]) or capacity
+local last_refill = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - last_refill) * rate)
+
+local allowed = 0
+local retry_after_ms = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after_ms = math.ceil((cost - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'last_refill', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, retry_after_ms}
@@ -3,28 +3,109 @@ Shared test fixtures for VA-Calibration API tests.
 Simplified version focusing on core functionality.
 """
 
+import copy
+import glob
 import pytest
 import pytest_asyncio
-from unittest.mock import MagicMock
+import fakeredis
+import fakeredis.aioredis
+from unittest.mock import MagicMock, patch
+from contextlib import ExitStack
+from types import MappingProxyType, SimpleNamespace
+import httpx
 from httpx import AsyncClient, ASGITransport
 from typing import Dict, List, Any
 import sys
 import os
+import hashlib
+import itertools
+import json
+import shutil
+import subprocess
+import threading
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# The in-memory per-minute rate limiter is shared by every test in the session
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "100000")
+
 from app.main_direct import app
+from app.redis_pubsub import RedisManager
 
+# Scripts under smoke/ talk to a running API server, Redis and Celery worker;
+# run them directly (e.g. ``python tests/smoke/test_ws_logs.py``)
+collect_ignore = ["smoke"]
 
-@pytest_asyncio.fixture
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        default=False,
+        help="Reuse real-R calibration results stored in .pytest_cache by earlier runs",
+    )
+
+
+def pytest_configure(config):
+    """Register the custom markers used across the suite."""
+    config.addinivalue_line("markers", "integration: multi-endpoint workflow tests")
+    config.addinivalue_line("markers", "cacheable(name): R results may be served from the --cached store")
+    # Provided by pytest-xdist when installed; registered here so plain runs stay quiet
+    config.addinivalue_line("markers", "xdist_group(name): run the marked tests on one xdist worker")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def async_client():
-    """Async HTTP client for testing FastAPI endpoints."""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+    """Async HTTP client for testing FastAPI endpoints, shared by the whole session."""
+    # Explicit limits so the concurrent job tests are never capped by the pool
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", limits=limits
+    ) as client:
         yield client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run anyio-marked tests on asyncio only."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+def fake_redis_server():
+    """In-memory Redis server shared by the app and test clients, reused per module."""
+    return fakeredis.FakeServer()
+
+
+@pytest_asyncio.fixture
+async def fake_redis_client(fake_redis_server):
+    """Async Redis client for seeding and inspecting job state."""
+    client = fakeredis.aioredis.FakeRedis(server=fake_redis_server, decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(autouse=True)
+def _patch_redis(monkeypatch, fake_redis_server):
+    """Point the job store at the fake server once per test instead of per block."""
+    from app import job_endpoints
+
+    client = fakeredis.FakeRedis(server=fake_redis_server, decode_responses=True)
+    monkeypatch.setattr("app.job_endpoints.redis_client", client)
+    monkeypatch.setattr(
+        "app.job_endpoints.async_redis_client",
+        fakeredis.aioredis.FakeRedis(server=fake_redis_server, decode_responses=True)
+    )
+    yield
+    # The server outlives the test, so leave it empty for the next one; rendered
+    # statuses are keyed by version counters that restart with it
+    client.flushall()
+    job_endpoints._status_cache.clear()
+
+
+# Sample payloads are built once per session; tests only send them, never mutate them
+@pytest.fixture(scope="session")
 def sample_specific_causes() -> List[Dict[str, str]]:
     """Sample specific cause data for testing."""
     return [
@@ -36,7 +117,7 @@ def sample_specific_causes() -> List[Dict[str, str]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_binary_matrix() -> List[List[int]]:
     """Sample binary matrix data for broad causes (neonate)."""
     # Columns: congenital_malformation, pneumonia, sepsis_meningitis_inf, ipre, other, prematurity
@@ -49,7 +130,7 @@ def sample_binary_matrix() -> List[List[int]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_death_counts() -> Dict[str, int]:
     """Sample death counts by broad cause (neonate)."""
     # Death counts format as per API design: dictionary with cause names as keys
@@ -63,7 +144,7 @@ def sample_death_counts() -> Dict[str, int]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def child_binary_matrix() -> List[List[int]]:
     """Sample binary matrix for child age group."""
     # Columns: malaria, pneumonia, diarrhea, severe_malnutrition, hiv, injury, other, other_infections, nn_causes
@@ -76,62 +157,73 @@ def child_binary_matrix() -> List[List[int]]:
     ]
 
 
+_R_SUCCESS_OUTPUT = {
+    "success": True,
+    "uncalibrated": {
+        "pneumonia": 0.15,
+        "sepsis_meningitis_inf": 0.30,
+        "ipre": 0.25,
+        "prematurity": 0.20,
+        "congenital_malformation": 0.05,
+        "other": 0.05
+    },
+    "calibrated": {
+        "insilicova": {
+            "pneumonia": 0.12,
+            "sepsis_meningitis_inf": 0.35,
+            "ipre": 0.22,
+            "prematurity": 0.23,
+            "congenital_malformation": 0.04,
+            "other": 0.04
+        }
+    }
+}
+
+
 @pytest.fixture
 def mock_r_success_output():
     """Mock successful R script output."""
-    return {
-        "success": True,
-        "uncalibrated": {
-            "pneumonia": 0.15,
-            "sepsis_meningitis_inf": 0.30,
-            "ipre": 0.25,
-            "prematurity": 0.20,
-            "congenital_malformation": 0.05,
-            "other": 0.05
-        },
-        "calibrated": {
-            "insilicova": {
-                "pneumonia": 0.12,
-                "sepsis_meningitis_inf": 0.35,
-                "ipre": 0.22,
-                "prematurity": 0.23,
-                "congenital_malformation": 0.04,
-                "other": 0.04
-            }
-        }
-    }
+    return copy.deepcopy(_R_SUCCESS_OUTPUT)
+
+
+_R_FAILURE_OUTPUT = {
+    "success": False,
+    "error": "R script execution failed: Missing required data"
+}
 
 
 @pytest.fixture
 def mock_r_failure_output():
     """Mock failed R script output."""
-    return {
-        "success": False,
-        "error": "R script execution failed: Missing required data"
-    }
+    return copy.deepcopy(_R_FAILURE_OUTPUT)
 
 
-@pytest.fixture
-def mock_subprocess_success():
-    """Mock successful subprocess run for R script execution."""
+def _completed_process_mock(returncode: int, stderr: str = "") -> MagicMock:
+    """Build a subprocess.run result mock; done once per prototype, not per test."""
     mock = MagicMock()
-    mock.returncode = 0
+    mock.returncode = returncode
     mock.stdout = ""
-    mock.stderr = ""
+    mock.stderr = stderr
     return mock
 
 
+_SUBPROCESS_SUCCESS = _completed_process_mock(0)
+_SUBPROCESS_FAILURE = _completed_process_mock(1, "Error: vacalibration package not found")
+
+
+@pytest.fixture
+def mock_subprocess_success():
+    """Mock successful subprocess run for R script execution."""
+    return copy.copy(_SUBPROCESS_SUCCESS)
+
+
 @pytest.fixture
 def mock_subprocess_failure():
     """Mock failed subprocess run for R script execution."""
-    mock = MagicMock()
-    mock.returncode = 1
-    mock.stdout = ""
-    mock.stderr = "Error: vacalibration package not found"
-    return mock
+    return copy.copy(_SUBPROCESS_FAILURE)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_r_ready():
     """Mock R setup check returning ready status."""
     def mock_check():
@@ -139,7 +231,7 @@ def mock_r_ready():
     return mock_check
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_r_not_ready():
     """Mock R setup check returning not ready status."""
     def mock_check():
@@ -158,6 +250,23 @@ def sample_calibration_request():
     }
 
 
+# Sample-dataset request shared by the /calibrate and /jobs/calibrate endpoint tests
+NEONATE_PAYLOAD = MappingProxyType({
+    "data_source": "sample",
+    "sample_dataset": "comsamoz_broad",  # comsamoz_broad is neonate data
+    "age_group": "neonate",
+    "country": "Mozambique",
+    "mmat_type": "prior",
+    "ensemble": False
+})
+
+
+@pytest.fixture
+def neonate_payload() -> Dict[str, Any]:
+    """Fresh copy of the neonate sample-dataset request; tests may change fields."""
+    return dict(NEONATE_PAYLOAD)
+
+
 @pytest.fixture
 def sample_calibration_request_with_data():
     """Sample calibration request with VA data."""
@@ -203,89 +312,100 @@ def sample_validate_request():
     }
 
 
+_DATASET_PREVIEW_OUTPUT = {
+    "success": True,
+    "sample_data": [
+        {"id": "death_001", "pneumonia": 0, "sepsis_meningitis_inf": 1, "ipre": 0, "prematurity": 0, "congenital_malformation": 0, "other": 0},
+        {"id": "death_002", "pneumonia": 1, "sepsis_meningitis_inf": 0, "ipre": 0, "prematurity": 0, "congenital_malformation": 0, "other": 0}
+    ],
+    "total_records": 1190,
+    "columns": ["pneumonia", "sepsis_meningitis_inf", "ipre", "prematurity", "congenital_malformation", "other"],
+    "statistics": {
+        "total_deaths": 1190,
+        "cause_distribution": {
+            "pneumonia": 180,
+            "sepsis_meningitis_inf": 420,
+            "ipre": 290,
+            "prematurity": 200,
+            "congenital_malformation": 60,
+            "other": 40
+        },
+        "most_common_cause": "sepsis_meningitis_inf",
+        "least_common_cause": "other"
+    },
+    "metadata": {
+        "description": "Mozambique COMSA study with broad cause assignments",
+        "age_group": "neonate",
+        "format": "binary_matrix",
+        "source": "COMSA study"
+    }
+}
+
+
 @pytest.fixture
 def mock_dataset_preview_output():
     """Mock dataset preview output."""
-    return {
-        "success": True,
-        "sample_data": [
-            {"id": "death_001", "pneumonia": 0, "sepsis_meningitis_inf": 1, "ipre": 0, "prematurity": 0, "congenital_malformation": 0, "other": 0},
-            {"id": "death_002", "pneumonia": 1, "sepsis_meningitis_inf": 0, "ipre": 0, "prematurity": 0, "congenital_malformation": 0, "other": 0}
-        ],
-        "total_records": 1190,
-        "columns": ["pneumonia", "sepsis_meningitis_inf", "ipre", "prematurity", "congenital_malformation", "other"],
-        "statistics": {
-            "total_deaths": 1190,
-            "cause_distribution": {
-                "pneumonia": 180,
-                "sepsis_meningitis_inf": 420,
-                "ipre": 290,
-                "prematurity": 200,
-                "congenital_malformation": 60,
-                "other": 40
-            },
-            "most_common_cause": "sepsis_meningitis_inf",
-            "least_common_cause": "other"
-        },
-        "metadata": {
-            "description": "Mozambique COMSA study with broad cause assignments",
-            "age_group": "neonate",
-            "format": "binary_matrix",
-            "source": "COMSA study"
-        }
-    }
+    return copy.deepcopy(_DATASET_PREVIEW_OUTPUT)
+
+
+_CAUSE_MAPPINGS_OUTPUT = {
+    "success": True,
+    "age_group": "neonate",
+    "broad_causes": ["congenital_malformation", "pneumonia", "sepsis_meningitis_inf", "ipre", "other", "prematurity"],
+    "mappings": [
+        {"specific_cause": "Birth asphyxia", "broad_cause": "ipre"},
+        {"specific_cause": "Neonatal sepsis", "broad_cause": "sepsis_meningitis_inf"},
+        {"specific_cause": "Prematurity", "broad_cause": "prematurity"},
+        {"specific_cause": "Pneumonia", "broad_cause": "pneumonia"},
+        {"specific_cause": "Congenital malformation", "broad_cause": "congenital_malformation"}
+    ]
+}
 
 
 @pytest.fixture
 def mock_cause_mappings_output():
     """Mock cause mappings output."""
-    return {
-        "success": True,
-        "age_group": "neonate",
-        "broad_causes": ["congenital_malformation", "pneumonia", "sepsis_meningitis_inf", "ipre", "other", "prematurity"],
-        "mappings": [
-            {"specific_cause": "Birth asphyxia", "broad_cause": "ipre"},
-            {"specific_cause": "Neonatal sepsis", "broad_cause": "sepsis_meningitis_inf"},
-            {"specific_cause": "Prematurity", "broad_cause": "prematurity"},
-            {"specific_cause": "Pneumonia", "broad_cause": "pneumonia"},
-            {"specific_cause": "Congenital malformation", "broad_cause": "congenital_malformation"}
-        ]
-    }
+    return copy.deepcopy(_CAUSE_MAPPINGS_OUTPUT)
+
+
+_CONVERT_CAUSES_OUTPUT = {
+    "success": True,
+    "converted_data": [
+        {"id": "d1", "specific_cause": "Birth asphyxia", "broad_cause": "ipre"},
+        {"id": "d2", "specific_cause": "Neonatal sepsis", "broad_cause": "sepsis_meningitis_inf"},
+        {"id": "d3", "specific_cause": "Prematurity", "broad_cause": "prematurity"}
+    ],
+    "broad_cause_matrix": {
+        "congenital_malformation": [0, 0, 0],
+        "pneumonia": [0, 0, 0],
+        "sepsis_meningitis_inf": [0, 1, 0],
+        "ipre": [1, 0, 0],
+        "other": [0, 0, 0],
+        "prematurity": [0, 0, 1]
+    },
+    "conversion_summary": {
+        "congenital_malformation": 0,
+        "pneumonia": 0,
+        "sepsis_meningitis_inf": 1,
+        "ipre": 1,
+        "other": 0,
+        "prematurity": 1
+    },
+    "unmapped_causes": []
+}
 
 
 @pytest.fixture
 def mock_convert_causes_output():
     """Mock convert causes output."""
-    return {
-        "success": True,
-        "converted_data": [
-            {"id": "d1", "specific_cause": "Birth asphyxia", "broad_cause": "ipre"},
-            {"id": "d2", "specific_cause": "Neonatal sepsis", "broad_cause": "sepsis_meningitis_inf"},
-            {"id": "d3", "specific_cause": "Prematurity", "broad_cause": "prematurity"}
-        ],
-        "broad_cause_matrix": {
-            "congenital_malformation": [0, 0, 0],
-            "pneumonia": [0, 0, 0],
-            "sepsis_meningitis_inf": [0, 1, 0],
-            "ipre": [1, 0, 0],
-            "other": [0, 0, 0],
-            "prematurity": [0, 0, 1]
-        },
-        "conversion_summary": {
-            "congenital_malformation": 0,
-            "pneumonia": 0,
-            "sepsis_meningitis_inf": 1,
-            "ipre": 1,
-            "other": 0,
-            "prematurity": 1
-        },
-        "unmapped_causes": []
-    }
+    return copy.deepcopy(_CONVERT_CAUSES_OUTPUT)
 
 
 @pytest.fixture
 def mock_tempfile(tmp_path):
-    """Mock tempfile.TemporaryDirectory to use pytest tmp_path."""
+    """Mock tempfile.TemporaryDirectory to hand out a fresh subdirectory of tmp_path per call."""
+    counter = itertools.count()
+
     def mock_temp_dir(*args, **kwargs):
         class MockTempDir:
             def __init__(self, path):
@@ -297,11 +417,211 @@ def mock_tempfile(tmp_path):
             def __exit__(self, *args):
                 pass
 
-        return MockTempDir(tmp_path)
+        work_dir = tmp_path / f"r_work_{next(counter)}"
+        work_dir.mkdir()
+        return MockTempDir(work_dir)
 
     return mock_temp_dir
 
 
+@pytest.fixture
+def r_env(mock_r_ready, mock_tempfile, tmp_path_factory):
+    """
+    Patch the R execution environment in one place for the workflow tests.
+
+    Tests set ``r_env.load_output.return_value`` to the R output they expect
+    (``None`` when R wrote nothing) and tweak ``r_env.run`` for failure scenarios.
+    """
+    load_output = MagicMock()
+
+    with ExitStack() as stack:
+        stack.enter_context(patch('app.main_direct.check_r_setup', mock_r_ready))
+        stack.enter_context(patch('tempfile.TemporaryDirectory', mock_tempfile))
+        stack.enter_context(patch(
+            'tempfile.mkdtemp',
+            side_effect=lambda *args, **kwargs: str(tmp_path_factory.mktemp("vacalib"))
+        ))
+        mock_run = stack.enter_context(patch(
+            'app.main_direct._run_r',
+            return_value=SimpleNamespace(returncode=0, stdout="", stderr="")
+        ))
+        # CalibrationService and the Celery task stream Rscript output from a started process
+        mock_popen = MagicMock()
+        stack.enter_context(patch('app.calibration_service._start_r', mock_popen))
+        stack.enter_context(patch('app.job_endpoints._start_r', mock_popen))
+        stack.enter_context(patch('app.main_direct._load_r_output', load_output))
+        stack.enter_context(patch('app.calibration_service._load_r_output', load_output))
+        stack.enter_context(patch('app.job_endpoints._load_r_output', load_output))
+        # An uninitialised manager has no publisher, so pub/sub calls are skipped
+        # instead of racing to connect to a Redis server that is not running
+        stack.enter_context(patch('app.redis_pubsub.redis_manager', RedisManager()))
+
+        mock_popen.return_value.stdout = []
+        mock_popen.return_value.wait.side_effect = lambda timeout=None: mock_run.return_value.returncode
+
+        yield SimpleNamespace(
+            run=mock_run,
+            popen=mock_popen,
+            load_output=load_output,
+        )
+
+
+@pytest.fixture
+def celery_eager(monkeypatch):
+    """
+    Run Celery jobs in-process: the task executes inside ``send_task`` and its
+    result lands in an in-memory backend, so ``/jobs/{id}`` is final on return.
+    """
+    from celery.backends.cache import CacheBackend
+    from app.job_endpoints import celery_app
+
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setitem(celery_app.conf, "task_store_eager_result", True)
+    # task_always_eager does not cover send_task, which always publishes to the broker
+    monkeypatch.setattr(
+        celery_app,
+        "send_task",
+        lambda name, args=None, kwargs=None, task_id=None, **options: (
+            celery_app.tasks[name].apply(args, kwargs, task_id=task_id)
+        ),
+    )
+    # app.backend is cached per thread; swap in one AsyncResult can read without Redis
+    monkeypatch.setattr(
+        celery_app._local, "backend", CacheBackend(app=celery_app, url="memory://"), raising=False
+    )
+    return celery_app
+
+
+R_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "r_worker.R")
+
+
+class RWorker:
+    """Client for the long-lived Rscript process started by the ``r_worker`` fixture."""
+
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self._lock = threading.Lock()
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one JSON request line and read back the one-line reply."""
+        with self._lock:
+            self.proc.stdin.write(json.dumps(payload) + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError("R worker exited unexpectedly")
+        return json.loads(line)
+
+    def run(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """Drop-in for ``app.main_direct._run_r``: run ``["Rscript", ...]`` in the worker."""
+        if cmd[1] == "-e":
+            reply = self.request({"expr": cmd[2]})
+        else:
+            reply = self.request({"script": cmd[1], "args": cmd[2:]})
+        return subprocess.CompletedProcess(cmd, reply["returncode"], stdout=reply["output"], stderr="")
+
+    def start(self, cmd: List[str]) -> SimpleNamespace:
+        """Drop-in for the ``_start_r`` helpers: a finished process-like result."""
+        result = self.run(cmd)
+        return SimpleNamespace(
+            stdout=[line + "\n" for line in result.stdout.splitlines()],
+            wait=lambda timeout=None: result.returncode,
+        )
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.write(json.dumps({"op": "quit"}) + "\n")
+            self.proc.stdin.flush()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+@pytest.fixture(scope="session")
+def r_worker():
+    """
+    One Rscript process with vacalibration loaded, shared by every real-R test.
+
+    Session scope means one per xdist worker, and only the worker that picks up
+    the ``r_worker`` xdist group ever requests it.
+    """
+    if shutil.which("Rscript") is None:
+        pytest.skip("Rscript not found - skipping R execution tests")
+
+    proc = subprocess.Popen(
+        ["Rscript", R_WORKER_SCRIPT],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd=os.getcwd()
+    )
+    worker = RWorker(proc)
+    # Wait for vacalibration to finish loading and pull the bundled .rda files
+    # into the page cache here, so the first R-backed test is not the slow one
+    worker.request({"op": "ping"})
+    for path in glob.glob(os.path.join("data", "*.rda")):
+        with open(path, "rb") as f:
+            while f.read(1 << 20):
+                pass
+    yield worker
+    worker.close()
+
+
+class RCalibrationCache:
+    """
+    Serve repeated calibration runs from ``.pytest_cache``.
+
+    Entries are keyed on the R script and its input JSON, and hold the console
+    output plus the output file the script wrote.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def _key(self, script_path: str, input_path: str) -> str:
+        digest = hashlib.sha256()
+        for path in (script_path, input_path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        return f"vacalibration/r_calibration/{digest.hexdigest()}"
+
+    def wrap(self, start):
+        """Wrap a ``_start_r`` drop-in so hits skip R and misses are recorded."""
+        def cached_start(cmd: List[str]) -> SimpleNamespace:
+            script_path, input_path, output_path = cmd[1:4]
+            key = self._key(script_path, input_path)
+            entry = self.cache.get(key, None)
+            if entry is None:
+                process = start(cmd)
+                lines = list(process.stdout)
+                returncode = process.wait()
+                output = None
+                if os.path.exists(output_path):
+                    with open(output_path) as f:
+                        output = f.read()
+                entry = {"returncode": returncode, "stdout": lines, "output": output}
+                if returncode == 0:
+                    self.cache.set(key, entry)
+            elif entry["output"] is not None:
+                with open(output_path, "w") as f:
+                    f.write(entry["output"])
+            return SimpleNamespace(
+                stdout=entry["stdout"],
+                wait=lambda timeout=None: entry["returncode"],
+            )
+
+        return cached_start
+
+
+@pytest.fixture(scope="session")
+def r_calibration_cache(request):
+    """Cross-run calibration result store, or None unless pytest ran with ``--cached``."""
+    if not request.config.getoption("--cached"):
+        return None
+    return RCalibrationCache(request.config.cache)
+
+
 @pytest.fixture
 def edge_case_data():
     """Edge case test data."""
@@ -314,7 +634,7 @@ def edge_case_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def performance_test_data():
     """Large dataset for performance testing."""
     return {
@@ -333,9 +653,12 @@ def performance_test_data():
 @pytest.fixture(autouse=True)
 def mock_file_exists(monkeypatch):
     """Mock os.path.exists to always return True for data files."""
+    real_exists = os.path.exists
+
     def mock_exists(path):
-        if "data/" in path and path.endswith(".rda"):
+        if "data/" in str(path) and str(path).endswith(".rda"):
             return True
-        return False
+        # Everything else (temp dirs, R outputs) is checked against the real filesystem
+        return real_exists(path)
 
-    monkeypatch.setattr("os.path.exists", mock_exists)
\ No newline at end of file
+    monkeypatch.setattr("os.path.exists", mock_exists)
@@ -3,16 +3,112 @@ Integration tests for end-to-end workflows.
 Test ID: IT-001, IT-002, IT-003
 """
 
+import asyncio
 import pytest
 import pytest_asyncio
-from unittest.mock import patch, MagicMock, mock_open
 from httpx import AsyncClient
 import json
 import time
 
 from app.main_direct import app
 
+# Canned R outputs shared by the workflow tests; nothing downstream mutates them
+_ENSEMBLE_OUTPUT = {
+    "success": True,
+    "uncalibrated": {
+        "pneumonia": 0.15,
+        "sepsis_meningitis_inf": 0.30,
+        "ipre": 0.25,
+        "prematurity": 0.20,
+        "congenital_malformation": 0.05,
+        "other": 0.05
+    },
+    "calibrated": {
+        "insilicova": {
+            "pneumonia": 0.12,
+            "sepsis_meningitis_inf": 0.35,
+            "ipre": 0.22,
+            "prematurity": 0.23,
+            "congenital_malformation": 0.04,
+            "other": 0.04
+        },
+        "interva": {
+            "pneumonia": 0.14,
+            "sepsis_meningitis_inf": 0.33,
+            "ipre": 0.24,
+            "prematurity": 0.21,
+            "congenital_malformation": 0.04,
+            "other": 0.04
+        },
+        "eava": {
+            "pneumonia": 0.13,
+            "sepsis_meningitis_inf": 0.34,
+            "ipre": 0.23,
+            "prematurity": 0.22,
+            "congenital_malformation": 0.04,
+            "other": 0.04
+        }
+    }
+}
+
+_FAILURE_OUTPUT = {
+    "success": False,
+    "error": "R package vacalibration not found"
+}
+
+_PARTIAL_OUTPUT = {
+    "success": True,
+    "uncalibrated": {
+        "pneumonia": 0.15,
+        "sepsis_meningitis_inf": 0.30
+        # Missing other causes
+    },
+    "calibrated": {
+        "insilicova": {
+            "pneumonia": 0.12,
+            "sepsis_meningitis_inf": 0.35
+            # Missing other causes
+        }
+    }
+}
+
+_MIXED_FORMAT_OUTPUT = {
+    "success": True,
+    "uncalibrated": {"pneumonia": 0.15},
+    "calibrated": {
+        "insilicova": {"pneumonia": 0.12},
+        "interva": {"pneumonia": 0.14}
+    }
+}
+
+
+
+async def _get_json(client: AsyncClient, path: str):
+    """GET a metadata endpoint and return its JSON body."""
+    response = await client.get(path)
+    assert response.status_code == 200
+    return response.json()
+
+
+# Static metadata endpoints never change within a run, so fetch them once
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def supported_configurations(async_client):
+    """Response of /supported-configurations, fetched once per session."""
+    return await _get_json(async_client, "/supported-configurations")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def example_data_info(async_client):
+    """Response of /example-data, fetched once per session."""
+    return await _get_json(async_client, "/example-data")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def available_datasets(async_client):
+    """Response of /datasets, fetched once per session."""
+    return await _get_json(async_client, "/datasets")
 
+@pytest.mark.xdist_group(name="end_to_end")
 class TestEndToEndCalibrationWorkflow:
     """
     Test cases for complete calibration workflow from data submission to results.
@@ -20,443 +116,257 @@ class TestEndToEndCalibrationWorkflow:
     """
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_complete_sync_calibration_workflow(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
+        r_env,
         mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        supported_configurations,
+        example_data_info
     ):
         """
         Test ID: IT-001-01
         Submit → Process → Results (sync) should complete workflow successfully.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Step 1: Check API health
-            health_response = await async_client.get("/")
-            assert health_response.status_code == 200
-            assert health_response.json()["status"] == "healthy"
-
-            # Step 2: Get supported configurations
-            config_response = await async_client.get("/supported-configurations")
-            assert config_response.status_code == 200
-            config_data = config_response.json()
-            assert "neonate" in config_data["age_groups"]
-            assert "Mozambique" in config_data["countries"]
-
-            # Step 3: Get example data information
-            example_response = await async_client.get("/example-data")
-            assert example_response.status_code == 200
-            example_data = example_response.json()
-            assert "neonate" in example_data
-
-            # Step 4: Run calibration with example data
-            calibration_response = await async_client.post("/calibrate", json={
-                "age_group": "neonate",
-                "country": "Mozambique",
-                "ensemble": True
-            })
+        r_env.load_output.return_value = mock_r_success_output
+
+        # Step 1: Check API health
+        health_response = await async_client.get("/")
+        assert health_response.status_code == 200
+        assert health_response.json()["status"] == "healthy"
+
+        # Step 2: Get supported configurations
+        assert "neonate" in supported_configurations["age_groups"]
+        assert "Mozambique" in supported_configurations["countries"]
+
+        # Step 3: Get example data information
+        assert "neonate" in example_data_info
+
+        # Step 4: Run calibration with example data
+        calibration_response = await async_client.post("/calibrate", json={
+            "age_group": "neonate",
+            "country": "Mozambique",
+            "ensemble": True
+        })
 
-            assert calibration_response.status_code == 200
-            calibration_data = calibration_response.json()
+        assert calibration_response.status_code == 200
+        calibration_data = calibration_response.json()
 
-            assert calibration_data["status"] == "success"
-            assert "uncalibrated" in calibration_data
-            assert "calibrated" in calibration_data
-            assert calibration_data["age_group"] == "neonate"
-            assert calibration_data["country"] == "Mozambique"
+        assert calibration_data["status"] == "success"
+        assert "uncalibrated" in calibration_data
+        assert "calibrated" in calibration_data
+        assert calibration_data["age_group"] == "neonate"
+        assert calibration_data["country"] == "Mozambique"
 
-            # Verify results structure
-            assert isinstance(calibration_data["uncalibrated"], dict)
-            assert isinstance(calibration_data["calibrated"], dict)
+        # Verify results structure
+        assert isinstance(calibration_data["uncalibrated"], dict)
+        assert isinstance(calibration_data["calibrated"], dict)
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_data_validation_conversion_calibration_workflow(
         self,
         async_client: AsyncClient,
         sample_specific_causes,
-        mock_r_ready,
+        r_env,
         mock_convert_causes_output,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        mock_r_success_output
     ):
         """
         Test ID: IT-001-04
         Data validation → Conversion → Calibration multi-step workflow.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True):
-
-            mock_run.return_value.returncode = 0
-
-            # Step 1: Validate input data
-            validate_data = {
-                "data": {
-                    "insilicova": sample_specific_causes
-                },
-                "age_group": "neonate",
-                "expected_format": "specific_causes"
-            }
-
-            with patch('json.load', return_value={}):  # No R output needed for validation
-                validate_response = await async_client.post("/validate", json=validate_data)
-
-            assert validate_response.status_code == 200
-            validation_result = validate_response.json()
-
-            # Should be valid (assuming mock validation passes)
-            if validation_result["overall_valid"]:
-                # Step 2: Convert specific causes to broad causes
-                convert_data = {
-                    "data": sample_specific_causes,
-                    "age_group": "neonate"
-                }
-
-                with patch('json.load', return_value=mock_convert_causes_output):
-                    convert_response = await async_client.post("/convert/causes", json=convert_data)
+        # Step 1: Validate input data
+        validate_data = {
+            "data": {
+                "insilicova": sample_specific_causes
+            },
+            "age_group": "neonate",
+            "expected_format": "specific_causes"
+        }
 
-                assert convert_response.status_code == 200
-                convert_result = convert_response.json()
+        r_env.load_output.return_value = {}  # No R output needed for validation
+        validate_response = await async_client.post("/validate", json=validate_data)
 
-                assert "broad_cause_matrix" in convert_result
-                broad_cause_matrix = convert_result["broad_cause_matrix"]
+        assert validate_response.status_code == 200
+        validation_result = validate_response.json()
 
-                # Step 3: Calibrate using converted broad causes
-                calibrate_data = {
-                    "va_data": {
-                        "insilicova": broad_cause_matrix
-                    },
-                    "age_group": "neonate",
-                    "country": "Mozambique"
-                }
+        # Should be valid (assuming mock validation passes)
+        if validation_result["overall_valid"]:
+            # Step 2: Convert specific causes to broad causes
+            convert_data = {
+                "data": sample_specific_causes,
+                "age_group": "neonate"
+            }
 
-                with patch('json.load', return_value=mock_r_success_output):
-                    calibrate_response = await async_client.post("/calibrate", json=calibrate_data)
+            r_env.load_output.return_value = mock_convert_causes_output
+            convert_response = await async_client.post("/convert/causes", json=convert_data)
 
-                assert calibrate_response.status_code == 200
-                calibration_result = calibrate_response.json()
+            assert convert_response.status_code == 200
+            convert_result = convert_response.json()
 
-                assert calibration_result["status"] == "success"
-                assert "calibrated" in calibration_result
+            assert "broad_cause_matrix" in convert_result
+            broad_cause_matrix = convert_result["broad_cause_matrix"]
 
-    @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_multiple_algorithms_ensemble_workflow(
-        self,
-        async_client: AsyncClient,
-        mock_r_ready,
-        mock_tempfile,
-        tmp_path
-    ):
-        """
-        Test ID: IT-001-03
-        Multiple algorithms ensemble should return combined results.
-        """
-        ensemble_output = {
-            "success": True,
-            "uncalibrated": {
-                "pneumonia": 0.15,
-                "sepsis_meningitis_inf": 0.30,
-                "ipre": 0.25,
-                "prematurity": 0.20,
-                "congenital_malformation": 0.05,
-                "other": 0.05
-            },
-            "calibrated": {
-                "insilicova": {
-                    "pneumonia": 0.12,
-                    "sepsis_meningitis_inf": 0.35,
-                    "ipre": 0.22,
-                    "prematurity": 0.23,
-                    "congenital_malformation": 0.04,
-                    "other": 0.04
-                },
-                "interva": {
-                    "pneumonia": 0.14,
-                    "sepsis_meningitis_inf": 0.33,
-                    "ipre": 0.24,
-                    "prematurity": 0.21,
-                    "congenital_malformation": 0.04,
-                    "other": 0.04
+            # Step 3: Calibrate using converted broad causes
+            calibrate_data = {
+                "va_data": {
+                    "insilicova": broad_cause_matrix
                 },
-                "eava": {
-                    "pneumonia": 0.13,
-                    "sepsis_meningitis_inf": 0.34,
-                    "ipre": 0.23,
-                    "prematurity": 0.22,
-                    "congenital_malformation": 0.04,
-                    "other": 0.04
-                }
-            }
-        }
-
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=ensemble_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Test ensemble calibration
-            response = await async_client.post("/calibrate", json={
                 "age_group": "neonate",
-                "country": "Mozambique",
-                "ensemble": True
-            })
-
-            assert response.status_code == 200
-            data = response.json()
+                "country": "Mozambique"
+            }
 
-            assert data["status"] == "success"
-            assert "calibrated" in data
+            r_env.load_output.return_value = mock_r_success_output
+            calibrate_response = await async_client.post("/calibrate", json=calibrate_data)
 
-            # Should have multiple algorithms for ensemble
-            calibrated_algorithms = list(data["calibrated"].keys())
-            assert len(calibrated_algorithms) >= 1
+            assert calibrate_response.status_code == 200
+            calibration_result = calibrate_response.json()
 
-            # Verify each algorithm has results
-            for algorithm in calibrated_algorithms:
-                algorithm_results = data["calibrated"][algorithm]
-                assert isinstance(algorithm_results, dict)
-                assert len(algorithm_results) > 0
+            assert calibration_result["status"] == "success"
+            assert "calibrated" in calibration_result
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_dataset_preview_to_calibration_workflow(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
+        r_env,
         mock_dataset_preview_output,
         mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        available_datasets
     ):
         """
         Test workflow from dataset preview to calibration.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True):
-
-            mock_run.return_value.returncode = 0
-
-            # Step 1: List available datasets
-            datasets_response = await async_client.get("/datasets")
-            assert datasets_response.status_code == 200
-            datasets = datasets_response.json()
-
-            # Find neonate dataset
-            neonate_dataset = next(
-                (d for d in datasets if d["age_group"] == "neonate" and "broad" in d["name"]),
-                None
-            )
-            assert neonate_dataset is not None
-
-            # Step 2: Preview the dataset
-            dataset_id = neonate_dataset["name"]
-
-            with patch('json.load', return_value=mock_dataset_preview_output):
-                preview_response = await async_client.get(f"/datasets/{dataset_id}/preview")
-
-            assert preview_response.status_code == 200
-            preview_data = preview_response.json()
-
-            assert "statistics" in preview_data
-            assert "cause_distribution" in preview_data["statistics"]
-
-            # Step 3: Use example data for calibration (simulating using the previewed dataset)
-            with patch('json.load', return_value=mock_r_success_output):
-                calibration_response = await async_client.post("/calibrate", json={
-                    "age_group": "neonate",
-                    "country": "Mozambique"
-                })
+        # Step 1: Find the neonate dataset among those available
+        neonate_dataset = next(
+            (d for d in available_datasets if d["age_group"] == "neonate" and "broad" in d["name"]),
+            None
+        )
+        assert neonate_dataset is not None
 
-            assert calibration_response.status_code == 200
-            calibration_data = calibration_response.json()
-            assert calibration_data["status"] == "success"
+        # Step 2: Preview the dataset
+        dataset_id = neonate_dataset["name"]
 
+        r_env.load_output.return_value = mock_dataset_preview_output
+        preview_response = await async_client.get(f"/datasets/{dataset_id}/preview")
 
-class TestErrorRecoveryScenarios:
-    """
-    Test cases for error handling and recovery.
-    Test ID: IT-002
-    """
+        assert preview_response.status_code == 200
+        preview_data = preview_response.json()
 
-    @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_r_script_failure_recovery(
-        self,
-        async_client: AsyncClient,
-        mock_r_ready,
-        mock_tempfile,
-        tmp_path
-    ):
-        """
-        Test ID: IT-002-01
-        R script failure should return graceful error message.
-        """
-        failure_output = {
-            "success": False,
-            "error": "R package vacalibration not found"
-        }
+        assert "statistics" in preview_data
+        assert "cause_distribution" in preview_data["statistics"]
 
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=failure_output):
+        # Step 3: Use example data for calibration (simulating using the previewed dataset)
+        r_env.load_output.return_value = mock_r_success_output
+        calibration_response = await async_client.post("/calibrate", json={
+            "age_group": "neonate",
+            "country": "Mozambique"
+        })
 
-            mock_run.return_value.returncode = 0
+        assert calibration_response.status_code == 200
+        calibration_data = calibration_response.json()
+        assert calibration_data["status"] == "success"
 
-            response = await async_client.post("/calibrate", json={
-                "age_group": "neonate",
-                "country": "Mozambique"
-            })
 
-            assert response.status_code == 400
-            error_data = response.json()
-            assert "detail" in error_data
-            assert "R package vacalibration not found" in error_data["detail"]
+@pytest.mark.xdist_group(name="error_recovery")
+class TestErrorRecoveryScenarios:
+    """
+    Test cases for error handling and recovery.
+    Test ID: IT-002
+    """
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_partial_data_processing_handling(
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("r_output,ensemble,expected_status,check", [
+        # IT-001-03: Multiple algorithms ensemble returns combined results
+        (_ENSEMBLE_OUTPUT, True, 200, lambda d: d["status"] == "success" and all(
+            isinstance(results, dict) and results for results in d["calibrated"].values()
+        )),
+        # IT-002-03: Partial data processing is handled gracefully
+        (_PARTIAL_OUTPUT, False, 200, lambda d: d["status"] == "success"
+         and "uncalibrated" in d and "calibrated" in d),
+        # IT-002-01: R script failure returns a graceful error message
+        (_FAILURE_OUTPUT, False, 400, lambda d: "R package vacalibration not found" in d["detail"]),
+    ], ids=["ensemble", "partial_data", "r_script_failure"])
+    async def test_calibrate_r_outcomes(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
-        mock_tempfile,
-        tmp_path
+        r_env,
+        r_output,
+        ensemble,
+        expected_status,
+        check
     ):
         """
-        Test ID: IT-002-03
-        Partial data processing should be handled gracefully.
+        Test ID: IT-001-03, IT-002-01, IT-002-03
+        Each R outcome should map to the expected API response.
         """
-        partial_output = {
-            "success": True,
-            "uncalibrated": {
-                "pneumonia": 0.15,
-                "sepsis_meningitis_inf": 0.30
-                # Missing other causes
-            },
-            "calibrated": {
-                "insilicova": {
-                    "pneumonia": 0.12,
-                    "sepsis_meningitis_inf": 0.35
-                    # Missing other causes
-                }
-            }
-        }
-
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=partial_output):
+        r_env.load_output.return_value = r_output
 
-            mock_run.return_value.returncode = 0
+        payload = {"age_group": "neonate", "country": "Mozambique"}
+        if ensemble:
+            payload["ensemble"] = True
 
-            response = await async_client.post("/calibrate", json={
-                "age_group": "neonate",
-                "country": "Mozambique"
-            })
+        response = await async_client.post("/calibrate", json=payload)
 
-            # Should still return success with partial data
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
-            assert "uncalibrated" in data
-            assert "calibrated" in data
+        assert response.status_code == expected_status
+        assert check(response.json())
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_timeout_and_retry_simulation(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
-        mock_tempfile,
-        tmp_path
+        r_env
     ):
         """
         Test ID: IT-002-02
         Simulate timeout scenario and verify error handling.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('os.path.exists', return_value=False):  # No output file = timeout/failure
-
-            mock_run.return_value.returncode = 1
-            mock_run.return_value.stdout = ""
-            mock_run.return_value.stderr = "Process timed out"
+        r_env.load_output.return_value = None  # No output file = timeout/failure
+        r_env.run.return_value.returncode = 1
+        r_env.run.return_value.stdout = ""
+        r_env.run.return_value.stderr = "Process timed out"
 
-            response = await async_client.post("/calibrate", json={
-                "age_group": "neonate",
-                "country": "Mozambique"
-            })
+        response = await async_client.post("/calibrate", json={
+            "age_group": "neonate",
+            "country": "Mozambique"
+        })
 
-            assert response.status_code == 500
-            error_data = response.json()
-            assert "detail" in error_data
-            assert "Process timed out" in error_data["detail"]
+        assert response.status_code == 500
+        error_data = response.json()
+        assert "detail" in error_data
+        assert "Process timed out" in error_data["detail"]
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_sequential_api_call_resilience(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        r_env,
+        mock_r_success_output
     ):
         """
         Test that API can handle sequential calls without issues.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Make multiple sequential requests
-            for i in range(3):
-                response = await async_client.post("/calibrate", json={
-                    "age_group": "neonate",
-                    "country": "Mozambique"
-                })
+        r_env.load_output.return_value = mock_r_success_output
 
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "success"
+        # Make multiple sequential requests
+        for i in range(3):
+            response = await async_client.post("/calibrate", json={
+                "age_group": "neonate",
+                "country": "Mozambique"
+            })
 
-                # Brief pause between requests
-                await asyncio.sleep(0.1)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "success"
 
 
+@pytest.mark.xdist_group(name="data_formats")
 class TestDataFormatCompatibility:
     """
     Test cases for all data format conversions.
@@ -464,260 +374,125 @@ class TestDataFormatCompatibility:
     """
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_specific_to_broad_to_calibrate_format_chain(
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("va_data_fixtures,age_group,country,convert_first,ensemble", [
+        # IT-003-01: Specific → Broad → Calibrate format chain
+        ({"insilicova": "sample_specific_causes"}, "neonate", "Mozambique", True, False),
+        # IT-003-02: Death counts processed directly
+        ({"insilicova": "sample_death_counts"}, "neonate", "Mozambique", False, False),
+        # IT-003-03: Mixed format ensemble
+        ({"insilicova": "sample_binary_matrix", "interva": "sample_death_counts"},
+         "neonate", "Mozambique", False, True),
+        # Different age groups with appropriate data formats
+        (None, "neonate", "Mozambique", False, False),
+        ({"insilicova": "child_binary_matrix"}, "child", "Kenya", False, False),
+    ], ids=["specific_to_broad", "death_counts", "mixed_format", "neonate_example", "child_binary"])
+    async def test_format_compatibility(
         self,
+        request,
         async_client: AsyncClient,
-        sample_specific_causes,
-        mock_r_ready,
+        r_env,
         mock_convert_causes_output,
         mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        va_data_fixtures,
+        age_group,
+        country,
+        convert_first,
+        ensemble
     ):
         """
-        Test ID: IT-003-01
-        Specific → Broad → Calibrate format chain should work.
+        Test ID: IT-003-01, IT-003-02, IT-003-03
+        Each supported input format should calibrate successfully.
         """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True):
-
-            mock_run.return_value.returncode = 0
+        payload = {"age_group": age_group, "country": country}
+        if ensemble:
+            payload["ensemble"] = True
+
+        if va_data_fixtures:
+            va_data = {
+                algorithm: request.getfixturevalue(name)
+                for algorithm, name in va_data_fixtures.items()
+            }
 
-            # Step 1: Convert specific causes to broad causes
-            with patch('json.load', return_value=mock_convert_causes_output):
+            if convert_first:
+                # Step 1: Convert specific causes to broad causes
+                r_env.load_output.return_value = mock_convert_causes_output
                 convert_response = await async_client.post("/convert/causes", json={
-                    "data": sample_specific_causes,
-                    "age_group": "neonate"
-                })
-
-            assert convert_response.status_code == 200
-            convert_data = convert_response.json()
-            broad_matrix = convert_data["broad_cause_matrix"]
-
-            # Step 2: Use broad cause matrix for calibration
-            with patch('json.load', return_value=mock_r_success_output):
-                calibrate_response = await async_client.post("/calibrate", json={
-                    "va_data": {
-                        "insilicova": broad_matrix
-                    },
-                    "age_group": "neonate",
-                    "country": "Mozambique"
+                    "data": va_data["insilicova"],
+                    "age_group": age_group
                 })
 
-            assert calibrate_response.status_code == 200
-            calibration_data = calibrate_response.json()
-            assert calibration_data["status"] == "success"
-
-    @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_death_counts_direct_processing(
-        self,
-        async_client: AsyncClient,
-        sample_death_counts,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
-    ):
-        """
-        Test ID: IT-003-02
-        Death counts should be processed directly.
-        """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
-
-            response = await async_client.post("/calibrate", json={
-                "va_data": {
-                    "insilicova": sample_death_counts
-                },
-                "age_group": "neonate",
-                "country": "Mozambique"
-            })
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
-
-    @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_mixed_format_ensemble_handling(
-        self,
-        async_client: AsyncClient,
-        sample_binary_matrix,
-        sample_death_counts,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
-    ):
-        """
-        Test ID: IT-003-03
-        Mixed format ensemble should handle multiple formats.
-        """
-        mixed_format_output = {
-            "success": True,
-            "uncalibrated": {"pneumonia": 0.15},
-            "calibrated": {
-                "insilicova": {"pneumonia": 0.12},
-                "interva": {"pneumonia": 0.14}
-            }
-        }
-
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mixed_format_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Use different formats for different algorithms
-            response = await async_client.post("/calibrate", json={
-                "va_data": {
-                    "insilicova": sample_binary_matrix,
-                    "interva": sample_death_counts
-                },
-                "age_group": "neonate",
-                "country": "Mozambique",
-                "ensemble": True
-            })
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
-
-    @pytest.mark.integration
-    @pytest.mark.asyncio
-    async def test_cross_age_group_compatibility(
-        self,
-        async_client: AsyncClient,
-        child_binary_matrix,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
-    ):
-        """
-        Test that different age groups work with appropriate data formats.
-        """
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Test neonate age group
-            neonate_response = await async_client.post("/calibrate", json={
-                "age_group": "neonate",
-                "country": "Mozambique"
-            })
+                assert convert_response.status_code == 200
+                va_data = {"insilicova": convert_response.json()["broad_cause_matrix"]}
 
-            assert neonate_response.status_code == 200
-            neonate_data = neonate_response.json()
-            assert neonate_data["age_group"] == "neonate"
+            payload["va_data"] = va_data
 
-            # Test child age group
-            child_response = await async_client.post("/calibrate", json={
-                "va_data": {
-                    "insilicova": child_binary_matrix
-                },
-                "age_group": "child",
-                "country": "Kenya"
-            })
+        r_env.load_output.return_value = (
+            _MIXED_FORMAT_OUTPUT if ensemble else mock_r_success_output
+        )
+        response = await async_client.post("/calibrate", json=payload)
 
-            assert child_response.status_code == 200
-            child_data = child_response.json()
-            assert child_data["age_group"] == "child"
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["age_group"] == age_group
 
 
+@pytest.mark.xdist_group(name="performance")
 class TestPerformanceIntegration:
     """Performance-related integration tests."""
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_large_dataset_processing(
         self,
         async_client: AsyncClient,
         performance_test_data,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        r_env,
+        mock_r_success_output
     ):
         """Test API performance with large datasets."""
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
+        r_env.load_output.return_value = mock_r_success_output
 
-            start_time = time.time()
-            response = await async_client.post("/calibrate", json=performance_test_data)
-            end_time = time.time()
+        start_time = time.perf_counter()
+        response = await async_client.post("/calibrate", json=performance_test_data)
+        processing_time = time.perf_counter() - start_time
 
-            processing_time = end_time - start_time
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
 
-            # Performance check - should complete within reasonable time
-            # (This is a mock test, so times will be very fast)
-            assert processing_time < 10.0  # 10 seconds for integration test
+        # Performance check - R is mocked, so anything near a second means the
+        # API itself has regressed (e.g. quadratic handling of large payloads)
+        assert processing_time < 1.0
 
     @pytest.mark.integration
-    @pytest.mark.asyncio
+    @pytest.mark.anyio
     async def test_concurrent_request_handling(
         self,
         async_client: AsyncClient,
-        mock_r_ready,
-        mock_r_success_output,
-        mock_tempfile,
-        tmp_path
+        r_env,
+        mock_r_success_output
     ):
         """Test handling of concurrent requests."""
-        import asyncio
-
-        with patch('app.main_direct.check_r_setup', mock_r_ready), \
-             patch('tempfile.TemporaryDirectory', mock_tempfile), \
-             patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=mock_r_success_output):
-
-            mock_run.return_value.returncode = 0
-
-            # Create multiple concurrent requests
-            tasks = []
-            for i in range(3):
-                task = async_client.post("/calibrate", json={
-                    "age_group": "neonate",
-                    "country": "Mozambique"
-                })
-                tasks.append(task)
+        r_env.load_output.return_value = mock_r_success_output
+
+        payload = {
+            "age_group": "neonate",
+            "country": "Mozambique"
+        }
 
-            # Wait for all requests to complete
-            responses = await asyncio.gather(*tasks)
+        # Fan out enough concurrent requests to exercise event-loop fairness
+        tasks = [async_client.post("/calibrate", json=payload) for _ in range(32)]
+
+        # Wait for all requests to complete
+        responses = await asyncio.gather(*tasks)
+
+        # All should succeed
+        for response in responses:
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "success"
 
-            # All should succeed
-            for response in responses:
-                assert response.status_code == 200
-                data = response.json()
-                assert data["status"] == "success"
\ No newline at end of file
+        # Every request ran as its own calibration job
+        assert len({response.json()["job_id"] for response in responses}) == len(responses)
\ No newline at end of file
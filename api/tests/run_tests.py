@@ -7,7 +7,42 @@ Provides convenient commands for running different test categories.
 import sys
 import subprocess
 import argparse
+import importlib.util
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def in_project_env():
+    """Return True when this interpreter is already the project's virtualenv."""
+    return bool(os.environ.get("POETRY_ACTIVE")) or sys.prefix != sys.base_prefix
+
+
+def execute(cmd):
+    """Run one pytest command and return its exit code."""
+    if cmd[0] == "pytest":
+        # Already inside the venv: run pytest in this interpreter, skipping
+        # the poetry bootstrap and the fork/exec of a second Python
+        import pytest
+
+        os.chdir(API_DIR)
+        return int(pytest.main(cmd[1:]))
+    # The runner opens no descriptors worth hiding from pytest, so skip the
+    # close-all-fds sweep subprocess otherwise does before exec
+    return subprocess.run(cmd, cwd=API_DIR, close_fds=False, env=os.environ.copy()).returncode
+
+
+def report(description, returncode):
+    """Print the outcome of a command and return whether it passed."""
+    if returncode != 0:
+        print(f"❌ {description} failed with return code {returncode}")
+        return False
+    else:
+        print(f"✅ {description} passed")
+        return True
 
 
 def run_command(cmd, description):
@@ -16,13 +51,25 @@ def run_command(cmd, description):
     print(f"Running: {' '.join(cmd)}")
     print("-" * 60)
 
-    result = subprocess.run(cmd, cwd=os.path.dirname(os.path.abspath(__file__)) + "/..")
-    if result.returncode != 0:
-        print(f"❌ {description} failed with return code {result.returncode}")
-        return False
-    else:
-        print(f"✅ {description} passed")
-        return True
+    return report(description, execute(cmd))
+
+
+def run_commands_in_parallel(commands):
+    """Run independent (cmd, description) pairs in separate processes at once."""
+    for cmd, description in commands:
+        print(f"\n🧪 {description}")
+        print(f"Running: {' '.join(cmd)}")
+    print("-" * 60)
+
+    # spawn, not fork: each worker imports the app and Celery from scratch
+    # instead of inheriting this process's module state
+    with ProcessPoolExecutor(
+        max_workers=len(commands), mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = [(description, pool.submit(execute, cmd)) for cmd, description in commands]
+        results = [report(description, future.result()) for description, future in futures]
+
+    return all(results)
 
 
 def main():
@@ -41,30 +88,70 @@ def main():
         action="store_true",
         help="Run tests in verbose mode"
     )
+    parser.add_argument(
+        "--cov",
+        action="store_true",
+        help="Collect coverage for the selected tests (the coverage target always does)"
+    )
     parser.add_argument(
         "--no-cov",
         action="store_true",
-        help="Skip coverage reporting"
+        help="Skip coverage reporting when --cov is also given"
     )
     parser.add_argument(
         "--parallel",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Run tests in parallel with pytest-xdist (default: on when pytest-xdist is installed)"
+    )
+    parser.add_argument(
+        "--parallel-categories",
         action="store_true",
-        help="Run tests in parallel (where supported)"
+        help="For 'all', run the unit and integration suites as two concurrent pytest processes"
+    )
+
+    # Reordering/selection driven by pytest's own .pytest_cache
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--failed-first",
+        action="store_true",
+        help="Run all selected tests, last run's failures first (pytest --ff)"
+    )
+    cache_group.add_argument(
+        "--last-failed",
+        action="store_true",
+        help="Only rerun the tests that failed last run (pytest --lf)"
+    )
+    cache_group.add_argument(
+        "--new-first",
+        action="store_true",
+        help="Run newly added test files first (pytest --nf)"
     )
 
     args = parser.parse_args()
 
     # Base pytest command
-    base_cmd = ["poetry", "run", "pytest"]
+    base_cmd = ["pytest"] if in_project_env() else ["poetry", "run", "pytest"]
 
     if args.verbose:
         base_cmd.append("-v")
 
+    if args.failed_first:
+        base_cmd.append("--ff")
+    elif args.last_failed:
+        base_cmd.append("--lf")
+    elif args.new_first:
+        base_cmd.append("--nf")
+
+    if args.parallel is None:
+        args.parallel = importlib.util.find_spec("xdist") is not None
+
     if args.parallel:
-        base_cmd.extend(["-n", "auto"])  # Requires pytest-xdist
+        # loadgroup keeps xdist_group-marked tests (e.g. the R worker ones) on one worker
+        base_cmd.extend(["-n", "auto", "--dist", "loadgroup"])  # Requires pytest-xdist
 
-    # Coverage options
-    if not args.no_cov and args.test_type in ["all", "unit", "coverage"]:
+    # Coverage is opt-in outside the coverage target: tracing slows the dev loop
+    if args.cov and not args.no_cov and args.test_type != "coverage":
         base_cmd.extend([
             "--cov=app",
             "--cov-report=html",
@@ -75,11 +162,18 @@ def main():
     success = True
 
     if args.test_type == "all":
-        # Run all test categories
-        success &= run_command(
-            base_cmd + ["tests/unit", "tests/integration"],
-            "All Tests"
-        )
+        if args.parallel_categories:
+            # Composes with --parallel: each suite still fans out over xdist workers
+            success &= run_commands_in_parallel([
+                (base_cmd + ["tests/unit"], "Unit Tests"),
+                (base_cmd + ["tests/integration"], "Integration Tests"),
+            ])
+        else:
+            # Run all test categories
+            success &= run_command(
+                base_cmd + ["tests/unit", "tests/integration"],
+                "All Tests"
+            )
 
     elif args.test_type == "unit":
         success &= run_command(
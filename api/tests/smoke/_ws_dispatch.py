@@ -0,0 +1,67 @@
+"""
+Per-type message formatting for the WebSocket smoke scripts
+
+Kept in its own fully annotated module so it can be compiled ahead of time
+without touching the scripts:
+
+    mypyc tests/smoke/_ws_dispatch.py
+
+The compiled extension lands next to this file and is imported in its place.
+"""
+from itertools import islice
+from typing import Any, Callable, Dict, Tuple
+
+Handler = Callable[[str, Dict[str, Any]], Tuple[bool, str]]
+
+
+# Per-type message formatters: each takes (msg_type, data) and returns
+# (stop, text), where stop ends the stream once results or an error arrive
+def _on_connection(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    return False, f"[{msg_type.upper()}] {data.get('message', '')}"
+
+def _on_log(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    return False, f"[LOG] {data.get('line', '')}"
+
+def _on_progress(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    progress = data.get('progress', 0)
+    stage = data.get('stage', '')
+    return False, f"[PROGRESS] {progress:.1f}% - {stage}"
+
+def _on_status(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    status = data.get('status', '')
+    msg = data.get('message', '')
+    return False, f"[STATUS] {status}: {msg}"
+
+def _on_result(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    lines = ["[RESULT] Calibration completed!"]
+    # Pretty print a sample of results
+    if 'result' in data:
+        result = data['result']
+        if 'calibrated' in result:
+            lines.append("Sample calibrated values:")
+            for algo, values in result['calibrated'].items():
+                if 'mean' in values:
+                    lines.append(f"  {algo}: {list(islice(values['mean'].items(), 3))}...")
+                break
+    return True, "\n".join(lines)
+
+def _on_error(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    return True, f"[ERROR] {data.get('error', 'Unknown error')}"
+
+def _on_other(msg_type: str, data: Dict[str, Any]) -> Tuple[bool, str]:
+    return False, f"[{msg_type.upper()}] {data}"
+
+HANDLERS: Dict[str, Handler] = {
+    "connection": _on_connection,
+    "log": _on_log,
+    "progress": _on_progress,
+    "status": _on_status,
+    "result": _on_result,
+    "error": _on_error,
+}
+
+
+def handle_message(msg_data: Dict[str, Any]) -> Tuple[bool, str]:
+    """Format one decoded frame by type; result and error end the stream"""
+    msg_type: str = msg_data.get("type", "unknown")
+    return HANDLERS.get(msg_type, _on_other)(msg_type, msg_data.get("data", {}))
@@ -0,0 +1,291 @@
+"""
+Shared client for the WebSocket smoke scripts
+
+Creates a calibration job over HTTP, streams /ws/calibrate/{job_id}/logs and
+hands every frame to a script-specific formatter. test_websocket.py and
+test_ws_logs.py only supply the endpoint, the payload and the formatter.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import sys
+import time
+import httpx
+import websockets
+
+# orjson parses each streamed frame (and encodes request bodies) faster; stdlib json otherwise
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+
+# ijson walks a large result frame without building its whole calibrated dict
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# uvloop cuts event-loop overhead on the receive loop; stock asyncio otherwise
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+API_URL = "http://localhost:8000"
+WS_URL = "ws://localhost:8000"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Log frames are short text: skip permessage-deflate and the frame-size cap (the
+# final result frame can be large), bound the receive queue, and read in bigger chunks
+CONNECT_OPTIONS = {
+    "compression": None,
+    "max_size": None,
+    "max_queue": 256,
+    "read_limit": 2**20,
+    "write_limit": 2**20,
+}
+
+# Cap on frames handled per wakeup, so a burst can't delay the timeout check for long
+DRAIN_LIMIT = 64
+
+# Drained batches buffered between the reader and the printer; a full queue stops
+# the reader, which in turn lets websockets apply backpressure (max_queue frames)
+PIPELINE_DEPTH = 4
+
+# Seconds without a frame before giving up on the stream
+IDLE_TIMEOUT = 30.0
+
+# Calibrated means kept from a result frame; the formatters only show a sample
+RESULT_SAMPLE_SIZE = 3
+
+# Job statuses after which the streamed status is final (JobStatus values, plus the
+# realtime service's "completed")
+TERMINAL_STATUSES = frozenset({"success", "completed", "failed", "cancelled", "timeout"})
+
+# Top-level WebSocketMessage fields kept as-is from a result frame
+FRAME_FIELDS = ("type", "job_id", "timestamp", "sequence")
+
+
+def run(coro):
+    """Run a smoke coroutine to completion, on uvloop when it is installed."""
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        return runner.run(coro)
+
+
+def is_result_frame(message):
+    """Peek at the frame head; the server's compact model_dump_json puts type first."""
+    marker = '"type":"result"' if isinstance(message, str) else b'"type":"result"'
+    return marker in message[:64]
+
+
+def parse_result_frame(message, sample_size=RESULT_SAMPLE_SIZE):
+    """Decode a result frame incrementally, keeping only what the formatters print.
+
+    Top-level fields are kept; data.result.calibrated is cut down to the first
+    algorithm's first sample_size mean entries, and parsing stops once they are read.
+    """
+    frame = {"data": {"result": {}}}
+    calibrated = None
+    algo_prefix = mean = None
+    try:
+        for prefix, event, value in ijson.parse(message, use_float=True):
+            if prefix in FRAME_FIELDS:
+                frame[prefix] = value
+            elif prefix == "data.result.calibrated":
+                if event == "start_map":
+                    calibrated = frame["data"]["result"]["calibrated"] = {}
+                elif event == "map_key":
+                    if calibrated:
+                        break  # Only the first algorithm is sampled
+                    calibrated[value] = {}
+                    algo_prefix = f"data.result.calibrated.{value}"
+            elif algo_prefix is None:
+                continue
+            elif prefix == f"{algo_prefix}.mean" and event == "start_map":
+                mean = calibrated[next(iter(calibrated))]["mean"] = {}
+            elif mean is not None and event == "map_key" and prefix == f"{algo_prefix}.mean":
+                if len(mean) == sample_size:
+                    break
+            elif mean is not None and prefix.startswith(f"{algo_prefix}.mean."):
+                mean[prefix[len(algo_prefix) + 6:]] = value
+    except ijson.JSONError:
+        return json_loads(message)
+    return frame
+
+
+def raw_recv(websocket):
+    """Return websocket.recv, asking for undecoded bytes where the client supports it.
+
+    The asyncio client in websockets >= 13 takes recv(decode=False); orjson, json and
+    ijson all parse bytes, so text frames then skip the UTF-8 decode. The legacy
+    client pinned in pyproject always decodes.
+    """
+    if "decode" in inspect.signature(websocket.recv).parameters:
+        return functools.partial(websocket.recv, decode=False)
+    return websocket.recv
+
+
+async def drain(websocket, recv=None, limit=DRAIN_LIMIT):
+    """Wait for the next frame, then take any frames already queued behind it.
+
+    recv() returns immediately while the connection's message queue is non-empty,
+    so a burst of log lines is handled in one task switch instead of one per frame.
+    """
+    recv = recv or websocket.recv
+    batch = [await recv()]
+    while len(batch) < limit and getattr(websocket, "messages", None):
+        batch.append(await recv())
+    return batch
+
+
+async def receive(websocket, format_message):
+    """Print formatted frames until the formatter asks to stop or the stream ends.
+
+    Reading and formatting run as two tasks joined by a bounded queue, so the next
+    batch is read off the socket while the previous one is parsed and printed.
+
+    Returns the number of frames received and the last job status the stream
+    reported (None if it sent no status or result frame).
+    """
+    loop = asyncio.get_running_loop()
+    start_time = time.monotonic()
+    batches = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    message_count = 0
+    final_status = None
+
+    async def read_frames(idle):
+        recv = raw_recv(websocket)
+        try:
+            while True:
+                batch = await drain(websocket, recv)
+                idle.reschedule(loop.time() + IDLE_TIMEOUT)
+                await batches.put(batch)
+        except websockets.exceptions.ConnectionClosed:
+            await batches.put(None)
+
+    async def print_frames(reader):
+        nonlocal message_count, final_status
+        out = sys.stdout.write
+        lines = []
+        while (batch := await batches.get()) is not None:
+            stop = False
+            for message in batch:
+                message_count += 1
+                try:
+                    if ijson is not None and is_result_frame(message):
+                        msg_data = parse_result_frame(message)
+                    else:
+                        msg_data = json_loads(message)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    msg_data = None
+                    if isinstance(message, bytes):
+                        message = message.decode(errors="replace")
+                else:
+                    msg_type = msg_data.get("type")
+                    if msg_type == "status":
+                        final_status = msg_data.get("data", {}).get("status", final_status)
+                    elif msg_type == "result":
+                        final_status = "completed"
+
+                stop, text = format_message(message_count, message, msg_data)
+                lines.append(text)
+                if stop:
+                    break
+
+            # One write per batch instead of a print per line
+            out("\n".join(lines) + "\n")
+            lines.clear()
+            if stop:
+                # Canceling recv() is safe: no frame is lost mid-read
+                reader.cancel()
+                return
+
+        print("\nWebSocket connection closed.")
+
+    try:
+        # One idle timeout for the whole stream (avoids hanging forever),
+        # pushed back after every batch instead of re-armed per recv()
+        async with asyncio.timeout(IDLE_TIMEOUT) as idle:
+            async with asyncio.TaskGroup() as tg:
+                reader = tg.create_task(read_frames(idle))
+                tg.create_task(print_frames(reader))
+    except asyncio.TimeoutError:
+        elapsed = time.monotonic() - start_time
+        print(f"\nNo messages for {IDLE_TIMEOUT:.0f}s (total time: {elapsed:.1f}s). Job may have completed.")
+
+    return message_count, final_status
+
+
+async def run_calibration_ws(endpoint, payload, format_message, *, http_timeout=None, check_status=False):
+    """Create a job at endpoint and stream its WebSocket logs.
+
+    payload is the already-encoded JSON request body (see json_dumps), so scripts
+    serialise their constant payloads once at import.
+    format_message(count, message, msg_data) returns (stop, text); msg_data is the
+    decoded frame, or None when the frame isn't JSON. With check_status the job's
+    final status is reported once the stream ends, from the stream itself when it
+    saw a terminal status and from the status endpoint otherwise.
+    """
+    async with httpx.AsyncClient(base_url=API_URL, timeout=http_timeout) as client:
+        print(f"1. Creating calibration job via {endpoint}...")
+        response = await client.post(endpoint, content=payload, headers=JSON_HEADERS)
+        if response.status_code != 200:
+            print(f"Failed to create job: {response.text}")
+            return
+
+        job_id = response.json().get("job_id")
+        if not job_id:
+            print(f"No job_id in response: {response.text}")
+            return
+        print(f"Created job: {job_id}")
+
+        ws_url = f"{WS_URL}/ws/calibrate/{job_id}/logs"
+        print(f"\n2. Connecting to WebSocket: {ws_url}")
+
+        status_response = None
+        final_status = None
+        try:
+            async with websockets.connect(ws_url, **CONNECT_OPTIONS) as websocket:
+                print("Connected! Receiving messages...")
+                print("-" * 80)
+
+                message_count, final_status = await receive(websocket, format_message)
+
+                print("-" * 80)
+                print(f"Received {message_count} messages total")
+
+                if check_status and final_status not in TERMINAL_STATUSES:
+                    # Fetch the final status while the closing handshake runs
+                    _, status_response = await asyncio.gather(
+                        websocket.close(), client.get(f"/calibrate/{job_id}/status")
+                    )
+
+        except (websockets.WebSocketException, httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+            # Connection and protocol failures only; anything else is a bug and should surface
+            print(f"WebSocket error: {e}")
+
+        if not check_status:
+            return
+
+        print("\n3. Checking final job status...")
+        if final_status in TERMINAL_STATUSES:
+            # Already streamed; no need for another round trip
+            print(f"Job status: {final_status}")
+            if final_status in ("success", "completed"):
+                print("Calibration completed successfully!")
+            return
+
+        if status_response is None:
+            status_response = await client.get(f"/calibrate/{job_id}/status")
+        if status_response.status_code == 200:
+            status = status_response.json()
+            print(f"Job status: {status.get('status', 'unknown')}")
+            if status.get('result'):
+                print("Calibration completed successfully!")
+        else:
+            print(f"Failed to get status: {status_response.text}")
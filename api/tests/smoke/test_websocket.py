@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+WebSocket test for VA calibration API
+"""
+
+from _ws_dispatch import handle_message
+from _ws_harness import json_dumps, run, run_calibration_ws
+
+REALTIME_PAYLOAD = json_dumps({
+    "va_data": {"insilicova": "use_example"},
+    "age_group": "neonate",
+    "country": "Mozambique"
+})
+
+def format_message(count, message, msg_data):
+    """Format one frame by type; result and error end the stream"""
+    if msg_data is None:
+        return False, f"[RAW] {message}"
+    return handle_message(msg_data)
+
+async def test_websocket():
+    """Test WebSocket connection and messages"""
+    await run_calibration_ws("/calibrate/realtime", REALTIME_PAYLOAD, format_message, check_status=True)
+
+if __name__ == "__main__":
+    print("VA Calibration WebSocket Test")
+    print("=" * 50)
+    run(test_websocket())
+    print("\nTest completed!")
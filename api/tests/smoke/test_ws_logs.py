@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test WebSocket log streaming for calibration jobs
+"""
+from _ws_harness import json_dumps, run, run_calibration_ws
+
+# Use the format expected by the API (from frontend code)
+CALIBRATION_PAYLOAD = json_dumps({
+    "deaths": {
+        "death_1": 1,
+        "death_2": 0,
+        "death_3": 1
+    },
+    "dataset": "comsamoz_broad",
+    "ageGroup": "neonate",
+    "country": "Mozambique",
+    "algorithm": "InSilicoVA",
+    "ensemble": False,
+    "asyncMode": True
+})
+
+def format_message(count, message, data):
+    """Print every frame with its number, type and timestamp"""
+    if data is None:
+        return False, f"Raw message: {message}\n" + "-" * 80
+
+    msg_type = data.get("type", "unknown")
+    payload = data.get("data", {})
+    lines = [f"[{count}] Type: {msg_type}"]
+
+    if msg_type == "log":
+        lines.append(f"    Level: {payload.get('level', 'info')}")
+        lines.append(f"    Log: {payload.get('line', '')}")
+
+    elif msg_type == "status":
+        lines.append(f"    Status: {payload.get('status')}")
+        lines.append(f"    Message: {payload.get('message')}")
+
+    elif msg_type == "connection":
+        lines.append(f"    {payload.get('message')}")
+
+    lines.append(f"    Timestamp: {data.get('timestamp', '')}")
+    lines.append("-" * 80)
+    return False, "\n".join(lines)
+
+async def test_websocket_logs():
+    """Test WebSocket log streaming"""
+    await run_calibration_ws("/calibrate", CALIBRATION_PAYLOAD, format_message, http_timeout=10)
+    print("\nTest complete!")
+
+if __name__ == "__main__":
+    run(test_websocket_logs())
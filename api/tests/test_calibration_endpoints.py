@@ -3,117 +3,47 @@
 Test script to verify both calibration endpoints work with the shared R script module.
 """
 
-import requests
-import json
-import time
-import sys
+import asyncio
+import pytest
 
-# Test configuration
-BASE_URL = "http://localhost:8000"
+from app.calibration_service import get_calibration_service
 
-def test_celery_endpoint():
-    """Test the Celery-based /jobs/calibrate endpoint"""
-    print("Testing Celery endpoint (/jobs/calibrate)...")
-
-    payload = {
-        "age_group": "child",
-        "country": "USA",
-        "data_source": "sample",
-        "sample_dataset": "comsamoz_broad"
-    }
+pytestmark = pytest.mark.anyio
 
-    # Submit job
-    response = requests.post(f"{BASE_URL}/jobs/calibrate", json=payload)
-    if response.status_code != 200:
-        print(f"❌ Failed to create job: {response.status_code}")
-        print(response.text)
-        return False
 
-    result = response.json()
-    job_id = result.get("job_id")
-    print(f"✅ Job created: {job_id}")
+async def test_celery_endpoint(async_client, celery_eager, r_env, mock_r_success_output, neonate_payload):
+    """Test the Celery-based /jobs/calibrate endpoint"""
+    r_env.load_output.return_value = mock_r_success_output
+    payload = dict(neonate_payload, age_group="child", country="USA")
 
-    # Poll for completion
-    for i in range(30):  # Wait up to 30 seconds
-        time.sleep(1)
-        status_response = requests.get(f"{BASE_URL}/jobs/{job_id}")
-        if status_response.status_code == 200:
-            status_data = status_response.json()
-            if status_data.get("status") == "success":
-                print(f"✅ Job completed successfully")
-                return True
-            elif status_data.get("status") == "failed":
-                print(f"❌ Job failed: {status_data.get('error_details')}")
-                return False
+    # Submit job; the eager task has finished by the time the POST returns
+    response = await async_client.post("/jobs/calibrate", json=payload)
+    assert response.status_code == 200, f"Failed to create job: {response.text}"
+    job_id = response.json()["job_id"]
 
-    print("❌ Job timed out")
-    return False
+    status_response = await async_client.get(f"/jobs/{job_id}")
+    assert status_response.status_code == 200
+    status_data = status_response.json()
+    assert status_data["status"] == "success", f"Job failed: {status_data.get('error_details')}"
 
 
-def test_realtime_endpoint():
+async def test_realtime_endpoint(async_client, r_env, mock_r_success_output, neonate_payload):
     """Test the WebSocket/real-time /calibrate/realtime endpoint"""
-    print("\nTesting Real-time endpoint (/calibrate/realtime)...")
-
-    payload = {
-        "age_group": "neonate",
-        "country": "Mozambique",
-        "data_source": "sample",
-        "sample_dataset": "comsamoz_broad"
-    }
+    r_env.load_output.return_value = mock_r_success_output
 
     # Submit calibration request
-    response = requests.post(f"{BASE_URL}/calibrate/realtime", json=payload)
-    if response.status_code != 200:
-        print(f"❌ Failed to start calibration: {response.status_code}")
-        print(response.text)
-        return False
-
-    result = response.json()
-    job_id = result.get("job_id")
-    print(f"✅ Calibration started: {job_id}")
-
-    # Check status (note: real-time endpoint creates job but doesn't track it the same way)
-    time.sleep(2)  # Give it a moment to process
-
-    # Try to get status
-    status_response = requests.get(f"{BASE_URL}/calibrate/{job_id}/status")
-    if status_response.status_code == 200:
-        status_data = status_response.json()
-        print(f"✅ Status retrieved: {status_data.get('status')}")
-        return True
-    elif status_response.status_code == 404:
-        # This is expected for the real-time endpoint as it doesn't persist jobs
-        print("✅ Real-time endpoint responded (job not persisted, which is expected)")
-        return True
-    else:
-        print(f"❌ Unexpected status code: {status_response.status_code}")
-        return False
-
-
-def main():
-    """Run all tests"""
-    print("="*60)
-    print("Testing Calibration Endpoints with Shared R Script Module")
-    print("="*60)
-
-    # Test both endpoints
-    celery_success = test_celery_endpoint()
-    realtime_success = test_realtime_endpoint()
-
-    print("\n" + "="*60)
-    print("Test Results:")
-    print(f"  Celery endpoint:    {'✅ PASSED' if celery_success else '❌ FAILED'}")
-    print(f"  Real-time endpoint: {'✅ PASSED' if realtime_success else '❌ FAILED'}")
-    print("="*60)
+    response = await async_client.post("/calibrate/realtime", json=neonate_payload)
+    assert response.status_code == 200, f"Failed to start calibration: {response.text}"
 
-    # Return exit code
-    if celery_success and realtime_success:
-        print("\n✅ All tests passed! Both endpoints are working with the shared module.")
-        return 0
-    else:
-        print("\n❌ Some tests failed. Check the output above for details.")
-        return 1
+    job_id = response.json().get("job_id")
 
+    # The real-time endpoint only tracks jobs while they run, so either is fine here
+    status_response = await async_client.get(f"/calibrate/{job_id}/status")
+    assert status_response.status_code in (200, 404)
 
-if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    # The calibration runs as a background task on this event loop; wait for its
+    # completion signal so it finishes while the R mocks are still in place
+    job = await asyncio.wait_for(get_calibration_service().wait_for_job(job_id), timeout=10)
+    assert job is not None
+    assert job.status.value == "completed", job.error
+    assert job.result is not None
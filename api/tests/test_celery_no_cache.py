@@ -1,51 +1,20 @@
 #!/usr/bin/env python3
 """Test Celery endpoint with caching disabled"""
-import requests
-import time
-import json
+import pytest
 
-# Test Celery endpoint WITHOUT caching
-payload = {
-    "data_source": "sample",
-    "sample_dataset": "comsamoz_broad",
-    "age_group": "neonate",
-    "country": "Mozambique",
-    "mmat_type": "prior",
-    "ensemble": False,
-    "use_cache": False  # Disable caching to force fresh R script execution
-}
+pytestmark = pytest.mark.anyio
 
-print("Testing Celery /jobs/calibrate endpoint (no cache)...")
-print(f"Payload: {json.dumps(payload, indent=2)}\n")
 
-# Submit job
-response = requests.post("http://localhost:8000/jobs/calibrate", json=payload)
-print(f"Submit Status Code: {response.status_code}")
+async def test_celery_no_cache(async_client, celery_eager, r_env, mock_r_success_output, neonate_payload):
+    """With caching disabled the job runs R and finishes before POST returns."""
+    r_env.load_output.return_value = mock_r_success_output
+    neonate_payload["use_cache"] = False  # Disable caching to force fresh R script execution
 
-if response.status_code != 200:
-    print(f"Error: {response.text}")
-    exit(1)
+    response = await async_client.post("/jobs/calibrate", json=neonate_payload)
+    assert response.status_code == 200, response.text
+    job_id = response.json()["job_id"]
 
-job_data = response.json()
-job_id = job_data.get('job_id')
-print(f"Job ID: {job_id}\n")
-
-# Poll for results
-print("Waiting for job completion...")
-for i in range(30):  # Wait up to 30 seconds
-    time.sleep(1)
-    result_response = requests.get(f"http://localhost:8000/jobs/{job_id}")
-    result = result_response.json()
-
-    status = result.get('status')
-    print(f"[{i+1}s] Status: {status}")
-
-    if status == 'completed':
-        print("\n✅ Job completed successfully!")
-        print(f"Result: {json.dumps(result.get('result'), indent=2)}")
-        break
-    elif status == 'failed':
-        print(f"\n❌ Job failed: {result.get('error')}")
-        break
-else:
-    print("\n⚠️ Timeout waiting for job completion")
\ No newline at end of file
+    result_response = await async_client.get(f"/jobs/{job_id}")
+    assert result_response.status_code == 200
+    assert result_response.json()["status"] in ("success", "completed")
+    r_env.popen.assert_called_once()
@@ -3,44 +3,23 @@
 Test Celery endpoint with sample dataset parameters.
 """
 
-import requests
-import json
-import time
+import pytest
 
-BASE_URL = "http://localhost:8000"
+pytestmark = pytest.mark.anyio
 
-payload = {
-    "data_source": "sample",
-    "sample_dataset": "comsamoz_broad",
-    "age_group": "child",
-    "country": "Mozambique",
-    "mmat_type": "prior",
-    "ensemble": False
-}
 
-print("Testing Celery endpoint with sample dataset...")
-print(f"Payload: {json.dumps(payload, indent=2)}")
+async def test_celery_with_sample(async_client, celery_eager, r_env, mock_r_success_output, neonate_payload):
+    """The Celery endpoint completes a job for a bundled sample dataset."""
+    r_env.load_output.return_value = mock_r_success_output
+    neonate_payload["age_group"] = "child"
 
-# Submit job
-response = requests.post(f"{BASE_URL}/jobs/calibrate", json=payload)
-print(f"\nStatus Code: {response.status_code}")
-print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = await async_client.post("/jobs/calibrate", json=neonate_payload)
+    assert response.status_code == 200, response.text
+    job_id = response.json()["job_id"]
 
-if response.status_code == 200:
-    job_id = response.json().get("job_id")
-    print(f"\nPolling job {job_id}...")
-
-    for i in range(30):
-        time.sleep(1)
-        status_response = requests.get(f"{BASE_URL}/jobs/{job_id}")
-        if status_response.status_code == 200:
-            status_data = status_response.json()
-            status = status_data.get("status")
-            print(f"  Status: {status}")
-
-            if status == "success":
-                print("✅ Celery endpoint WORKS with sample dataset!")
-                break
-            elif status == "failed":
-                print(f"❌ Job failed: {status_data}")
-                break
\ No newline at end of file
+    status_response = await async_client.get(f"/jobs/{job_id}")
+    assert status_response.status_code == 200
+    status_data = status_response.json()
+    assert status_data["status"] == "success", f"Job failed: {status_data}"
+    assert status_data["result_summary"]["age_group"] == "child"
+    assert status_data["result_summary"]["country"] == "Mozambique"
@@ -1,29 +1,38 @@
 #!/usr/bin/env python3
 """Test how Pydantic serializes CalibrationRequest"""
 
-import sys
-sys.path.append('/Users/ericliu/projects5/vacalibration/api')
-
-from app.main_direct import CalibrationRequest
-import json
-
-# Create request with same data
-request = CalibrationRequest(
-    data_source="sample",
-    sample_dataset="comsamoz_broad",
-    age_group="child",
-    country="Mozambique",
-    mmat_type="prior",
-    ensemble=False,
-    async_=False
-)
-
-# See what model_dump produces
-dump = request.model_dump()
-print("model_dump() output:")
-print(json.dumps(dump, indent=2, default=str))
-
-print("\n\nChecking age_group type:")
-print(f"  Type: {type(dump['age_group'])}")
-print(f"  Value: {dump['age_group']}")
-print(f"  Repr: {repr(dump['age_group'])}")
\ No newline at end of file
+from enum import Enum
+
+
+def _sample_request():
+    # conftest.py puts api/ on sys.path and has already imported the app, so this
+    # is a module-cache hit; importing here keeps collection of this file cheap
+    from app.main_direct import CalibrationRequest
+
+    return CalibrationRequest(
+        data_source="sample",
+        sample_dataset="comsamoz_broad",
+        age_group="child",
+        country="Mozambique",
+        mmat_type="prior",
+        ensemble=False,
+        async_=False
+    )
+
+
+def test_age_group_dumps_as_str_enum():
+    """model_dump() keeps the AgeGroup enum, which still compares equal to its value."""
+    dump = _sample_request().model_dump()
+
+    assert isinstance(dump["age_group"], Enum)
+    assert isinstance(dump["age_group"], str)
+    assert dump["age_group"] == "child"
+
+
+def test_age_group_dumps_as_plain_str_in_json_mode():
+    """JSON-mode dumps hand R scripts and Celery a bare string."""
+    dump = _sample_request().model_dump(mode="json")
+
+    assert type(dump["age_group"]) is str
+    assert dump["age_group"] == "child"
+    assert dump["sample_dataset"] == "comsamoz_broad"
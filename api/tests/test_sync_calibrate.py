@@ -3,30 +3,19 @@
 Test the synchronous /calibrate endpoint specifically.
 """
 
-import requests
-import json
+import pytest
 
-BASE_URL = "http://localhost:8000"
+pytestmark = pytest.mark.anyio
 
-def test_sync_calibrate():
-    """Test the synchronous /calibrate endpoint"""
-    print("Testing synchronous /calibrate endpoint...")
-
-    payload = {
-        "data_source": "sample",
-        "sample_dataset": "comsamoz_broad",
-        "age_group": "neonate",  # Fixed: comsamoz_broad is neonate data
-        "country": "Mozambique",
-        "mmat_type": "prior",
-        "ensemble": False,
-        "async": False  # Force synchronous execution
-    }
 
-    print(f"Payload: {json.dumps(payload, indent=2)}")
+async def test_sync_calibrate(async_client, r_env, mock_r_success_output, neonate_payload):
+    """Test the synchronous /calibrate endpoint"""
+    r_env.load_output.return_value = mock_r_success_output
+    neonate_payload["async"] = False  # Force synchronous execution
 
-    response = requests.post(f"{BASE_URL}/calibrate", json=payload)
-    print(f"\nStatus Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    response = await async_client.post("/calibrate", json=neonate_payload)
 
-if __name__ == "__main__":
-    test_sync_calibrate()
\ No newline at end of file
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["status"] == "success"
+    assert "calibrated" in data
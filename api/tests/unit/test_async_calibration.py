@@ -414,44 +414,792 @@ class TestAsyncCalibrationJobs:
     async def test_list_user_jobs(
         self,
         async_client: AsyncClient,
-        mock_redis_client
+        fake_redis_client
     ):
         """
         Test ID: UT-ASYNC-001-09
-        Listing user jobs should return paginated results.
+        Listing user jobs should return paginated results from the user's job index.
         """
+        from app import job_endpoints
+        from app.security import current_user_id
+
         user_id = "test-user-123"
-        
-        # Setup multiple jobs for user
+        now = datetime.utcnow()
+        now_ms = job_endpoints.now_ms()
+
+        # Setup multiple jobs for user, indexed by creation time
         for i in range(5):
             job_id = f"job-{i}"
-            await mock_redis_client.hset(f"job:{job_id}", {
+            created_at = now - timedelta(hours=i)
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": created_at.isoformat(),
                 "user_id": user_id,
-                "status": "completed" if i < 3 else "running",
-                "created_at": (datetime.utcnow() - timedelta(hours=i)).isoformat(),
                 "age_group": "neonate",
                 "country": "Mozambique"
-            })
-            
-            # Add to user's job list
-            await mock_redis_client.hset(f"user:{user_id}:jobs", {job_id: "1"})
-        
-        with patch('app.async_calibration.redis_client', mock_redis_client):
-            response = await async_client.get(
-                f"/calibrate/async/jobs?user_id={user_id}&limit=3"
-            )
-            
+            }))
+            await fake_redis_client.zadd(f"user:{user_id}:jobs", {job_id: (now_ms - i * 3_600_000)})
+
+        token = current_user_id.set(user_id)
+        pipeline = job_endpoints.redis_client.pipeline
+        try:
+            # The page comes from the index alone; a keyspace walk would fail the test
+            with patch.object(job_endpoints.redis_client, "keys", side_effect=AssertionError("KEYS used")), \
+                 patch.object(job_endpoints.redis_client, "pipeline", side_effect=pipeline) as mock_pipeline, \
+                 patch('app.job_endpoints.get_celery_states', return_value=["SUCCESS"] * 3) as mock_states, \
+                 patch('app.job_endpoints.AsyncResult') as mock_async_result:
+                response = await async_client.get("/jobs?limit=3&offset=1")
+        finally:
+            current_user_id.reset(token)
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["total"] == 5
+        assert data["limit"] == 3
+        assert data["offset"] == 1
+        # Newest first, starting after the skipped job
+        assert [job["job_id"] for job in data["jobs"]] == ["job-1", "job-2", "job-3"]
+        # Index, then the page's metadata and progress: two round trips whatever the page size
+        assert mock_pipeline.call_count == 2
+        # Celery states come from one backend read for the whole page
+        mock_states.assert_called_once_with(["job-1", "job-2", "job-3"])
+        mock_async_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("celery_state", ["PENDING", "STARTED", "SUCCESS"])
+    async def test_job_status_skips_full_result(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        mock_r_success_output,
+        celery_state
+    ):
+        """
+        Test ID: UT-ASYNC-001-21
+        Status polls should not read the full result unless include_result is set.
+        """
+        from app import job_endpoints
+
+        job_id = "job-poll"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat()
+        }))
+        job_endpoints.store_job_result(job_id, {**mock_r_success_output, "age_group": "neonate"}, use_cache=False)
+
+        get = job_endpoints.redis_client.get
+        with patch.object(job_endpoints.redis_client, "get", side_effect=get) as mock_get, \
+             patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = celery_state
+
+            response = await async_client.get(f"/jobs/{job_id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] is None
+        assert f"job_result:{job_id}" not in [call.args[0] for call in mock_get.call_args_list]
+        if celery_state == "SUCCESS":
+            assert data["result_summary"]["age_group"] == "neonate"
+        else:
+            assert data["result_summary"] is None
+
+    @pytest.mark.asyncio
+    async def test_job_status_include_result(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        mock_r_success_output
+    ):
+        """
+        Test ID: UT-ASYNC-001-22
+        A completed job's full result should be returned with include_result=true.
+        """
+        from app import job_endpoints
+
+        job_id = "job-done"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat()
+        }))
+        job_endpoints.store_job_result(job_id, mock_r_success_output, use_cache=False)
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = "SUCCESS"
+
+            response = await async_client.get(f"/jobs/{job_id}?include_result=true")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["result"] == mock_r_success_output
+        assert data["result_summary"]["algorithms_processed"] == len(mock_r_success_output.get("calibrated", {}))
+
+    @pytest.mark.asyncio
+    async def test_job_result_stored_compressed(
+        self,
+        fake_redis_client,
+        mock_r_success_output
+    ):
+        """
+        Test ID: UT-ASYNC-001-23
+        Results should be stored gzip-compressed and still load as stored earlier.
+        """
+        import gzip
+        from app import job_endpoints
+
+        job_endpoints.store_job_result("job-gz", mock_r_success_output, use_cache=False)
+        await fake_redis_client.set("job_result:job-plain", json.dumps(mock_r_success_output))
+
+        blob = job_endpoints.redis_client.execute_command("GET", "job_result:job-gz", NEVER_DECODE=[])
+        assert json.loads(gzip.decompress(blob)) == mock_r_success_output
+        assert job_endpoints.load_job_result("job-gz") == mock_r_success_output
+        assert job_endpoints.load_job_result("job-plain") == mock_r_success_output
+        assert job_endpoints.load_job_result("job-missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cache_stats_epoch_timestamps(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-24
+        Cache entries carry epoch-ms timestamps; older ISO entries still count.
+        """
+        from app import job_endpoints
+
+        newest_ms = job_endpoints.now_ms()
+        oldest = datetime(2024, 1, 1, 12, 0, 0)
+        await fake_redis_client.set("calibration_result:new", json.dumps({
+            "result": {}, "cached_at_ms": newest_ms, "job_id": "job-new"
+        }))
+        await fake_redis_client.set("calibration_result:old", json.dumps({
+            "result": {}, "cached_at": oldest.isoformat(), "job_id": "job-old"
+        }))
+
+        response = await async_client.get("/api/v1/cache/stats")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_cached_results"] == 2
+        assert datetime.fromisoformat(data["oldest_cached_result"]) == oldest
+        assert datetime.fromisoformat(data["newest_cached_result"]) == job_endpoints.ms_to_datetime(newest_ms)
+
+    @pytest.mark.asyncio
+    async def test_long_poll_returns_on_state_change(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-26
+        A status long-poll should return on the job's next progress update.
+        """
+        from app import job_endpoints
+
+        job_id = "job-long-poll"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat()
+        }))
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = "STARTED"
+
+            poll = asyncio.create_task(async_client.get(f"/jobs/{job_id}?wait=10"))
+            # Publish only once the poll is listening
+            channel = job_endpoints.job_events_channel(job_id)
+            while (await fake_redis_client.pubsub_numsub(channel))[0][1] == 0:
+                await asyncio.sleep(0.01)
+            assert not poll.done()
+
+            started = asyncio.get_running_loop().time()
+            job_endpoints.update_job_progress(job_id, 3, 5, "Running R calibration")
+            response = await asyncio.wait_for(poll, 5)
+            elapsed = asyncio.get_running_loop().time() - started
+
+        assert response.status_code == 200
+        assert response.json()["progress"]["step_name"] == "Running R calibration"
+        assert elapsed < 1
+
+    @pytest.mark.asyncio
+    async def test_long_poll_times_out(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-27
+        A long-poll with no update should return the current status after wait seconds.
+        """
+        job_id = "job-quiet"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat()
+        }))
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = "PENDING"
+            response = await async_client.get(f"/jobs/{job_id}?wait=0.2")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_long_poll_returns_at_once_for_missing_or_finished_job(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-38
+        A long-poll should 404 at once for a missing job, and return at once when the
+        metadata already records a finished status, without asking Celery.
+        """
+        job_id = "job-already-cancelled"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat(),
+            "status": "cancelled"
+        }))
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = "REVOKED"
+            response = await asyncio.wait_for(async_client.get("/jobs/no-such-job?wait=10"), 1)
+            assert response.status_code == 404
+
+            response = await asyncio.wait_for(async_client.get(f"/jobs/{job_id}?wait=10"), 1)
+            assert response.status_code == 200
+            assert response.json()["status"] == "cancelled"
+            mock_async_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancel_is_single_check_and_set(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-28
+        Cancelling should be one script call; a finished job can't be cancelled again.
+        """
+        from redis.exceptions import ResponseError
+
+        job_id = "job-to-cancel"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat()
+        }))
+
+        def cancel(keys, args, client=None):
+            """Stand-in for job_cancel.lua (fakeredis has no Lua runtime here)"""
+            raw = client.get(keys[0])
+            if raw is None:
+                return 0
+            metadata = json.loads(raw)
+            if metadata.get("completed_at") is not None:
+                raise ResponseError("FINISHED")
+            client.set(keys[0], json.dumps({**metadata, "completed_at": args[0], "status": "cancelled"}), keepttl=True)
+            client.incr(keys[2])
+            client.expire(keys[2], args[1])
+            client.publish(keys[1], "cancelled")
+            return 1
+
+        with patch('app.job_endpoints.job_cancel', side_effect=cancel) as mock_cancel, \
+             patch('app.job_endpoints.celery_app.control.revoke') as mock_revoke:
+            response = await async_client.post(f"/jobs/{job_id}/cancel")
             assert response.status_code == 200
             data = response.json()
-            
-            assert "jobs" in data
-            assert "total" in data
-            assert "page" in data
-            assert "limit" in data
-            
-            assert len(data["jobs"]) <= 3
-            assert data["total"] == 5
-    
+            assert data["status"] == "cancelled"
+            assert "cancelled_at" in data
+            mock_cancel.assert_called_once()
+            mock_revoke.assert_called_once_with(job_id, terminate=True)
+
+            response = await async_client.post(f"/jobs/{job_id}/cancel")
+            assert response.status_code == 400
+            assert "cannot be cancelled" in response.json()["detail"]
+            assert mock_revoke.call_count == 1
+
+            response = await async_client.post("/jobs/job-missing/cancel")
+            assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("final_status", ["success", "failed", "cancelled", "timeout"])
+    async def test_finished_job_status_skips_celery(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        final_status
+    ):
+        """
+        Test ID: UT-ASYNC-001-29
+        A job with a recorded final status should be reported without asking Celery.
+        """
+        job_id = f"job-{final_status}"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat(),
+            "completed_at": datetime.utcnow().isoformat(),
+            "status": final_status
+        }))
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.failed.return_value = False
+
+            response = await async_client.get(f"/jobs/{job_id}")
+            assert response.status_code == 200
+            assert response.json()["status"] == final_status
+
+            response = await async_client.post("/jobs/status", json={"job_ids": [job_id]})
+            assert response.json()["jobs"][0]["status"] == final_status
+
+        # A failed job is still looked up once, for its error details
+        assert mock_async_result.call_count == (1 if final_status == "failed" else 0)
+
+    @pytest.mark.asyncio
+    async def test_progress_and_log_single_round_trip(
+        self,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-30
+        Each progress update and log event should be sent as one pipeline.
+        """
+        from app import job_endpoints
+        from app.job_endpoints import LogLevel
+
+        job_id = "job-ticks"
+        pipeline = job_endpoints.redis_client.pipeline
+        with patch.object(job_endpoints.redis_client, "pipeline", side_effect=pipeline) as mock_pipeline, \
+             patch.object(job_endpoints.redis_client, "execute_command", side_effect=AssertionError("unpipelined")):
+            for step in range(1, 6):
+                job_endpoints.update_job_progress(job_id, step, 5, f"Step {step}")
+                job_endpoints.log_job_event(job_id, LogLevel.INFO, f"Reached step {step}", "test")
+
+        assert mock_pipeline.call_count == 10
+        progress = json.loads(await fake_redis_client.get(f"job_progress:{job_id}"))
+        assert progress["step_name"] == "Step 5"
+        assert await fake_redis_client.llen(f"job_logs:{job_id}") == 5
+
+    @pytest.mark.asyncio
+    async def test_delete_job_single_round_trip(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        mock_r_success_output
+    ):
+        """
+        Test ID: UT-ASYNC-001-31
+        Deleting a job should remove its keys and index entry together; a missing job is a 404.
+        """
+        from app import job_endpoints
+
+        user_id = "user-deleting"
+        job_id = "job-to-delete"
+        await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+            "job_id": job_id,
+            "job_type": "calibration",
+            "created_at": datetime.utcnow().isoformat(),
+            "user_id": user_id,
+            "status": "success"
+        }))
+        await fake_redis_client.zadd(f"user:{user_id}:jobs", {job_id: 1})
+        job_endpoints.store_job_result(job_id, mock_r_success_output, use_cache=False)
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.return_value.state = "SUCCESS"
+
+            response = await async_client.delete(f"/jobs/{job_id}")
+            assert response.status_code == 200
+            # Metadata, result, result summary and version counter
+            assert response.json()["deleted_keys"] == 4
+
+            response = await async_client.delete(f"/jobs/{job_id}")
+            assert response.status_code == 404
+
+        assert not await fake_redis_client.exists(f"job_result:{job_id}")
+        # Nothing is written back for the deleted job
+        assert await fake_redis_client.keys(f"job_version:{job_id}") == []
+        assert await fake_redis_client.keys(f"job_logs:{job_id}") == []
+        assert await fake_redis_client.zcard(f"user:{user_id}:jobs") == 0
+
+    @pytest.mark.asyncio
+    async def test_task_loads_compressed_request(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        sample_calibration_request_with_data
+    ):
+        """
+        Test ID: UT-ASYNC-001-32
+        The request should be stored compressed and the task queued with the job ID only.
+        """
+        from app import job_endpoints
+
+        with patch('app.job_endpoints.celery_app.send_task') as mock_send_task:
+            response = await async_client.post("/jobs/calibrate", json=sample_calibration_request_with_data)
+
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        assert mock_send_task.call_args.kwargs["args"] == [job_id]
+        blob = job_endpoints.get_raw(f"job_request:{job_id}")
+        assert blob[:2] == job_endpoints.GZIP_MAGIC
+        request_data = job_endpoints.load_job_request(job_id)
+        assert request_data["va_data"] == sample_calibration_request_with_data["va_data"]
+
+    @pytest.mark.asyncio
+    async def test_status_response_cached_until_version_bump(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-33
+        Repeated polls should reuse the rendered status until the job is written to.
+        """
+        from app import job_endpoints
+
+        job_id = "job-polled"
+        job_endpoints.store_job_metadata(job_id, job_endpoints.JobMetadata(
+            job_id=job_id,
+            job_type="calibration",
+            created_at=datetime.utcnow()
+        ))
+
+        mget = job_endpoints.redis_client.mget
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result, \
+             patch.object(job_endpoints.redis_client, "mget", side_effect=mget) as mock_mget:
+            mock_async_result.return_value.state = "PENDING"
+
+            first = await async_client.get(f"/jobs/{job_id}")
+            second = await async_client.get(f"/jobs/{job_id}")
+            assert first.status_code == second.status_code == 200
+            assert second.content == first.content
+            assert mock_mget.call_count == 1
+
+            job_endpoints.update_job_progress(job_id, 2, 5, "Preparing data")
+            third = await async_client.get(f"/jobs/{job_id}")
+            assert mock_mget.call_count == 2
+            assert third.json()["progress"]["step_name"] == "Preparing data"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_job_is_not_stored(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        sample_calibration_request
+    ):
+        """
+        Test ID: UT-ASYNC-001-34
+        A rate-limited request should get 429 with the bucket's wait, and store nothing.
+        """
+        from app.security import current_user_id
+
+        token = current_user_id.set("user-throttled")
+        try:
+            with patch('app.job_endpoints.rate_limit_bucket', side_effect=[[0, 89_500], [1, 0]]) as mock_bucket, \
+                 patch('app.job_endpoints.celery_app.send_task') as mock_send_task:
+                response = await async_client.post("/jobs/calibrate", json=sample_calibration_request)
+                assert response.status_code == 429
+                assert response.headers["Retry-After"] == "90"
+                assert await fake_redis_client.keys("job_*") == []
+                mock_send_task.assert_not_called()
+
+                response = await async_client.post("/jobs/calibrate", json=sample_calibration_request)
+                assert response.status_code == 200
+                assert await fake_redis_client.exists(f"job_metadata:{response.json()['job_id']}")
+                mock_send_task.assert_called_once()
+        finally:
+            current_user_id.reset(token)
+
+        assert mock_bucket.call_args.kwargs["keys"] == ["bucket:user-throttled"]
+
+    @pytest.mark.asyncio
+    async def test_batch_takes_token_per_job(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        sample_calibration_request
+    ):
+        """
+        Test ID: UT-ASYNC-001-35
+        A batch should be charged one token per job, and rejected whole when short.
+        """
+        from app.security import current_user_id
+
+        token = current_user_id.set("user-batching")
+        try:
+            with patch('app.job_endpoints.rate_limit_bucket', return_value=[0, 5_000]) as mock_bucket, \
+                 patch('app.job_endpoints.celery_app.send_task') as mock_send_task:
+                response = await async_client.post(
+                    "/api/v1/calibrate/batch",
+                    json={"jobs": [sample_calibration_request] * 3}
+                )
+        finally:
+            current_user_id.reset(token)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "5"
+        # ARGV: capacity, refill rate, now, cost
+        assert mock_bucket.call_args.kwargs["args"][3] == 3
+        assert await fake_redis_client.keys("*") == []
+        mock_send_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_api_mutations_check_job_owner(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-36
+        Cancel, result and delete under /api/v1 should refuse another user's job,
+        and delete-all should only remove the caller's own jobs.
+        """
+        from redis.exceptions import ResponseError
+        from app.security import current_user_id
+
+        def owner_check(keys, args, client=None):
+            """Stand-in for job_owner_check.lua"""
+            raw = client.get(keys[0])
+            if raw is None:
+                return 0
+            if json.loads(raw).get("user_id") not in (None, args[0]):
+                raise ResponseError("FORBIDDEN")
+            return 1
+
+        for job_id, owner in (("job-of-a", "user-a"), ("job-of-b", "user-b")):
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": datetime.utcnow().isoformat(),
+                "user_id": owner,
+                "status": "success"
+            }))
+
+        token = current_user_id.set("user-b")
+        try:
+            with patch('app.job_endpoints.job_owner_check', owner_check), \
+                 patch('app.job_endpoints.AsyncResult') as mock_async_result:
+                mock_async_result.return_value.state = "SUCCESS"
+
+                response = await async_client.delete("/api/v1/calibrate/job-of-a")
+                assert response.status_code == 403
+                response = await async_client.get("/api/v1/calibrate/job-of-a/result")
+                assert response.status_code == 403
+                response = await async_client.delete("/api/v1/jobs/job-of-a")
+                assert response.status_code == 403
+
+                response = await async_client.delete("/api/v1/jobs/clear/all", params={"confirm": True})
+                assert response.status_code == 200
+        finally:
+            current_user_id.reset(token)
+
+        assert await fake_redis_client.exists("job_metadata:job-of-a")
+        assert not await fake_redis_client.exists("job_metadata:job-of-b")
+
+    @pytest.mark.asyncio
+    async def test_list_user_jobs_backfills_unindexed_jobs(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-37
+        Jobs stored before the user index existed should be indexed on first listing,
+        and an empty listing should only scan the keyspace once.
+        """
+        from app import job_endpoints
+        from app.security import current_user_id
+
+        now = datetime.utcnow()
+        for i, owner in enumerate(["user-old", "user-old", "someone-else"]):
+            job_id = f"legacy-job-{i}"
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": (now - timedelta(hours=i)).isoformat(),
+                "user_id": owner,
+                "age_group": "neonate"
+            }))
+
+        scan_iter = job_endpoints.redis_client.scan_iter
+        with patch('app.job_endpoints.get_celery_states', side_effect=lambda ids: ["SUCCESS"] * len(ids)), \
+             patch.object(job_endpoints.redis_client, "scan_iter", side_effect=scan_iter) as mock_scan:
+            for user_id in ("user-old", "user-new", "user-new"):
+                token = current_user_id.set(user_id)
+                try:
+                    response = await async_client.get("/jobs")
+                finally:
+                    current_user_id.reset(token)
+                assert response.status_code == 200
+                if user_id == "user-old":
+                    assert response.json()["total"] == 2
+                    assert [job["job_id"] for job in response.json()["jobs"]] == ["legacy-job-0", "legacy-job-1"]
+                else:
+                    assert response.json()["total"] == 0
+
+        assert await fake_redis_client.zcard("user:user-old:jobs") == 2
+        # One scan per user; the second empty listing is answered by the marker
+        assert mock_scan.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_does_not_overwrite_cancellation(
+        self,
+        fake_redis_client,
+        sample_calibration_request
+    ):
+        """
+        Test ID: UT-ASYNC-001-39
+        Worker metadata writes should leave a cancelled job cancelled, including when
+        the cancellation lands between the worker's read and its write.
+        """
+        from app import job_endpoints
+
+        job_id = "job-cancelled-mid-run"
+        metadata = job_endpoints.JobMetadata(
+            job_id=job_id,
+            job_type="calibration",
+            created_at=datetime.utcnow()
+        )
+        job_endpoints.store_job_metadata(job_id, metadata)
+        cancelled = metadata.model_copy(update={"status": job_endpoints.JobStatus.CANCELLED})
+
+        json_loads = job_endpoints.json_loads
+
+        def cancel_then_load(data):
+            # The user cancels after the worker has read the metadata
+            job_endpoints.redis_client.set(f"job_metadata:{job_id}", cancelled.model_dump_json())
+            return json_loads(data)
+
+        finished = metadata.model_copy(update={"status": job_endpoints.JobStatus.SUCCESS})
+        with patch('app.job_endpoints.json_loads', side_effect=cancel_then_load):
+            assert job_endpoints.update_job_metadata(job_id, finished) is False
+        assert json.loads(await fake_redis_client.get(f"job_metadata:{job_id}"))["status"] == "cancelled"
+
+        # A task picked up after cancellation stops before running R
+        with patch('app.job_endpoints._start_r') as mock_start_r:
+            outcome = job_endpoints.run_calibration_task(job_id, sample_calibration_request)
+        assert outcome == {"status": "cancelled"}
+        mock_start_r.assert_not_called()
+        assert json.loads(await fake_redis_client.get(f"job_metadata:{job_id}"))["status"] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_job_list_prefers_finished_metadata_status(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-40
+        A finished status in the metadata should win over the Celery state in job listings.
+        """
+        from app.security import current_user_id
+
+        user_id = "user-listing"
+        now = datetime.utcnow()
+        # (metadata status, Celery state, listed status)
+        cases = [
+            ("cancelled", "PENDING", "cancelled"),
+            ("failed", "SUCCESS", "failed"),
+            ("success", "PENDING", "completed"),
+            (None, "STARTED", "running"),
+        ]
+        for i, (metadata_status, _, _) in enumerate(cases):
+            job_id = f"job-listed-{i}"
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": (now - timedelta(minutes=i)).isoformat(),
+                "user_id": user_id,
+                "age_group": "neonate",
+                "status": metadata_status
+            }))
+            await fake_redis_client.zadd(f"user:{user_id}:jobs", {job_id: len(cases) - i})
+
+        token = current_user_id.set(user_id)
+        try:
+            with patch('app.job_endpoints.get_celery_states', return_value=[state for _, state, _ in cases]), \
+                 patch('app.job_endpoints.AsyncResult') as mock_async_result:
+                mock_async_result.return_value.failed.return_value = False
+                response = await async_client.get("/jobs")
+        finally:
+            current_user_id.reset(token)
+
+        assert response.status_code == 200
+        assert [job["status"] for job in response.json()["jobs"]] == [listed for _, _, listed in cases]
+
+    @pytest.mark.asyncio
+    async def test_finished_metadata_status_wins_everywhere(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-41
+        Listing, batch status, results and delete-all should report a failed job
+        (Celery SUCCESS) as failed and a cancelled job (Celery PENDING) as cancelled.
+        """
+        from app import job_endpoints
+
+        # job id -> (metadata status, Celery state)
+        jobs = {
+            "job-failed": ("failed", "SUCCESS"),
+            "job-cancelled": ("cancelled", "PENDING"),
+            "job-done": ("success", "SUCCESS"),
+        }
+        for job_id, (metadata_status, _) in jobs.items():
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": datetime.utcnow().isoformat(),
+                "completed_at": datetime.utcnow().isoformat(),
+                "age_group": "neonate",
+                "status": metadata_status
+            }))
+        job_endpoints.store_job_result("job-failed", {"status": "failed", "error": "R failed"}, use_cache=False)
+        await fake_redis_client.set("batch_metadata:batch-mixed", json.dumps({"batch_id": "batch-mixed"}))
+        await fake_redis_client.set("batch_jobs:batch-mixed", json.dumps(list(jobs)))
+
+        with patch('app.job_endpoints.AsyncResult') as mock_async_result:
+            mock_async_result.side_effect = lambda job_id, app=None: MagicMock(state=jobs[job_id][1])
+
+            for status in ("failed", "cancelled", "success"):
+                response = await async_client.get("/api/v1/jobs", params={"status": status})
+                assert response.status_code == 200
+                assert [job["job_id"] for job in response.json()["jobs"]] == [
+                    job_id for job_id, (metadata_status, _) in jobs.items() if metadata_status == status
+                ]
+
+            response = await async_client.get("/api/v1/calibrate/batch/batch-mixed/status")
+            assert response.status_code == 200
+            batch = response.json()
+            assert [job["status"] for job in batch["job_statuses"]] == ["failed", "cancelled", "success"]
+            assert (batch["completed_jobs"], batch["failed_jobs"], batch["pending_jobs"]) == (1, 1, 0)
+            assert batch["batch_status"] == "partial"
+
+            response = await async_client.get("/api/v1/calibrate/job-failed/result")
+            assert response.status_code == 200
+            assert response.json()["status"] == "failed"
+            response = await async_client.get("/api/v1/calibrate/job-cancelled/result")
+            assert response.status_code == 400
+
+            response = await async_client.delete("/api/v1/jobs/clear/all", params={"status": "success", "confirm": True})
+            assert response.status_code == 200
+
+        assert not await fake_redis_client.exists("job_metadata:job-done")
+        assert await fake_redis_client.exists("job_metadata:job-failed", "job_metadata:job-cancelled") == 2
+
     @pytest.mark.asyncio
     async def test_job_progress_updates(
         self,
@@ -497,6 +1245,99 @@ class TestAsyncCalibrationJobs:
                 assert data["stage"] == stage
 
 
+class TestBatchStatus:
+    """Test polling several jobs in one status call."""
+
+    @pytest.mark.asyncio
+    async def test_batch_status_single_round_trip(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client
+    ):
+        """
+        Test ID: UT-ASYNC-001-19
+        A batch poll should read Redis once and keep the requested order.
+        """
+        from app import job_endpoints
+
+        job_ids = [f"job-{i}" for i in range(5)]
+        for job_id in job_ids[:4]:
+            await fake_redis_client.set(f"job_metadata:{job_id}", json.dumps({
+                "job_id": job_id,
+                "job_type": "calibration",
+                "created_at": datetime.utcnow().isoformat()
+            }))
+        await fake_redis_client.set("job_progress:job-1", json.dumps({
+            "current_step": 2,
+            "total_steps": 5,
+            "step_name": "Running calibration",
+            "progress_percentage": 40.0
+        }))
+        requested = list(reversed(job_ids))
+        states = {"job-0": "SUCCESS", "job-1": "STARTED", "job-2": "FAILURE", "job-3": "PENDING"}
+
+        pipeline = job_endpoints.redis_client.pipeline
+        with patch.object(job_endpoints.redis_client, "pipeline", side_effect=pipeline) as mock_pipeline, \
+             patch('app.job_endpoints.get_celery_states',
+                   side_effect=lambda ids: [states.get(job_id, "PENDING") for job_id in ids]) as mock_states:
+            response = await async_client.post("/jobs/status", json={"job_ids": requested})
+
+        assert response.status_code == 200
+        jobs = response.json()["jobs"]
+
+        assert mock_pipeline.call_count == 1
+        # Only jobs that exist are looked up in the result backend
+        mock_states.assert_called_once_with(requested[1:])
+        assert [job["job_id"] for job in jobs] == requested
+        assert [job["status"] for job in jobs] == [None, "pending", "failed", "running", "success"]
+        assert jobs[0]["found"] is False
+        assert jobs[3]["progress"]["progress_percentage"] == 40.0
+
+    @pytest.mark.asyncio
+    async def test_batch_creation_single_transaction(
+        self,
+        async_client: AsyncClient,
+        fake_redis_client,
+        sample_calibration_request
+    ):
+        """
+        Test ID: UT-ASYNC-001-25
+        A batch should be stored in one MULTI/EXEC before any task is queued.
+        """
+        from app import job_endpoints
+
+        pipeline = job_endpoints.redis_client.pipeline
+        with patch.object(job_endpoints.redis_client, "pipeline", side_effect=pipeline) as mock_pipeline, \
+             patch('app.job_endpoints.celery_app.send_task') as mock_send_task:
+            response = await async_client.post(
+                "/api/v1/calibrate/batch",
+                json={"jobs": [sample_calibration_request] * 3}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        mock_pipeline.assert_called_once_with(transaction=True)
+        assert [call.kwargs["task_id"] for call in mock_send_task.call_args_list] == data["job_ids"]
+        assert json.loads(await fake_redis_client.get(f"batch_jobs:{data['batch_id']}")) == data["job_ids"]
+        for job_id in data["job_ids"]:
+            assert await fake_redis_client.exists(f"job_metadata:{job_id}")
+
+    def test_celery_states_single_backend_read(self):
+        """
+        Test ID: UT-ASYNC-001-20
+        Task states should come from one MGET on a key-value result backend.
+        """
+        from app.job_endpoints import celery_app, get_celery_states
+
+        backend = celery_app.backend
+        meta = backend.encode({"status": "SUCCESS", "result": None, "task_id": "job-a"})
+        with patch.object(type(backend), "mget", return_value=[meta, None]) as mock_mget:
+            assert get_celery_states(["job-a", "job-b"]) == ["SUCCESS", "PENDING"]
+
+        mock_mget.assert_called_once_with([backend.get_key_for_task("job-a"), backend.get_key_for_task("job-b")])
+
+
 class TestAsyncCalibrationErrorHandling:
     """Test error handling in async calibration."""
     
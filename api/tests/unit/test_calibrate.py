@@ -13,6 +13,9 @@ import os
 
 from app.main_direct import app
 
+# None of these tests inspect file handles, so one mock_open() serves them all
+_MOCK_OPEN = mock_open()
+
 
 class TestCalibrateEndpoint:
     """Test cases for the calibration endpoint."""
@@ -33,7 +36,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -74,7 +77,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -114,7 +117,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -154,7 +157,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -182,6 +185,25 @@ class TestCalibrateEndpoint:
         error_data = response.json()
         assert "detail" in error_data
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("country", [
+        "'; DROP TABLE jobs; --",
+        "<script>alert('xss')</script>",
+        "../../../etc/passwd",
+        "A" * 65,
+    ])
+    async def test_calibrate_malicious_country_rejected(self, async_client: AsyncClient, country):
+        """
+        Test ID: UT-002-05b
+        Country values outside the allowed pattern should fail model validation.
+        """
+        response = await async_client.post("/calibrate", json={
+            "age_group": "neonate",
+            "country": country
+        })
+
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_calibrate_invalid_country_uses_other(
         self,
@@ -198,7 +220,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -257,7 +279,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -297,7 +319,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=ensemble_output):
 
@@ -333,7 +355,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -396,7 +418,7 @@ class TestCalibrateEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_failure_output):
 
@@ -453,7 +475,7 @@ class TestCalibrateEdgeCases:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -484,7 +506,7 @@ class TestCalibrateEdgeCases:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -525,7 +547,7 @@ class TestCalibrateEdgeCases:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -551,7 +573,7 @@ class TestCalibrateEdgeCases:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_r_success_output):
 
@@ -11,6 +11,9 @@ import json
 
 from app.main_direct import app
 
+# None of these tests inspect file handles, so one mock_open() serves them all
+_MOCK_OPEN = mock_open()
+
 
 class TestExampleDataEndpoint:
     """
@@ -249,7 +252,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
@@ -301,7 +304,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
@@ -333,7 +336,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
@@ -370,7 +373,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
@@ -458,7 +461,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
@@ -484,7 +487,7 @@ class TestDatasetPreviewEndpoint:
         with patch('app.main_direct.check_r_setup', mock_r_ready), \
              patch('tempfile.TemporaryDirectory', mock_tempfile), \
              patch('subprocess.run') as mock_run, \
-             patch('builtins.open', mock_open()) as mock_file, \
+             patch('builtins.open', _MOCK_OPEN), \
              patch('os.path.exists', return_value=True), \
              patch('json.load', return_value=mock_dataset_preview_output):
 
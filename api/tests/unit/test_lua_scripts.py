@@ -0,0 +1,110 @@
+"""
+Unit tests for the Redis Lua scripts in api/scripts.
+Test ID: UT-LUA-001
+
+The tests in test_async_calibration.py stand in for these scripts with
+Python, since fakeredis only runs Lua when lupa is installed; here the
+scripts themselves run against fakeredis, and the module is skipped
+without lupa.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+import fakeredis
+from redis.exceptions import ResponseError
+
+pytest.importorskip("lupa")
+
+from app.job_endpoints import SCRIPTS_DIR, JobMetadata
+
+
+def load_script(client, filename):
+    with open(f"{SCRIPTS_DIR}/{filename}") as f:
+        return client.register_script(f.read())
+
+
+@pytest.fixture
+def lua_redis():
+    """A standalone fakeredis client (its own server) with Lua available"""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+class TestRateLimitScript:
+    """rate_limit.lua token bucket"""
+
+    def test_bucket_allows_capacity_then_reports_wait(self, lua_redis):
+        """
+        Test ID: UT-LUA-001-01
+        A full bucket should allow capacity requests, then return the refill wait.
+        """
+        bucket = load_script(lua_redis, "rate_limit.lua")
+        capacity, rate, now = 2, 2 / 3600, 1_000_000
+
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 1]) == [1, 0]
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 1]) == [1, 0]
+        # One token refills every 1800 s
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 1]) == [0, 1_800_000]
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now + 1800, 1]) == [1, 0]
+        assert 0 < lua_redis.pttl("bucket:u") <= 3_600_000
+
+    def test_cost_is_taken_together(self, lua_redis):
+        """
+        Test ID: UT-LUA-001-02
+        A multi-token request should be rejected whole when the bucket is short.
+        """
+        bucket = load_script(lua_redis, "rate_limit.lua")
+        capacity, rate, now = 5, 5 / 3600, 1_000_000
+
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 3]) == [1, 0]
+        # Two tokens left; three more need one refill (720 s)
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 3]) == [0, 720_000]
+        assert bucket(keys=["bucket:u"], args=[capacity, rate, now, 2]) == [1, 0]
+
+
+class TestJobCancelScript:
+    """job_cancel.lua check-and-set"""
+
+    def test_cancel_marks_job_once(self, lua_redis):
+        """
+        Test ID: UT-LUA-001-03
+        Cancelling should record the status once, bump the version and refuse a second time.
+        """
+        cancel = load_script(lua_redis, "job_cancel.lua")
+        metadata = JobMetadata(job_id="j", job_type="calibration", created_at=datetime.utcnow())
+        lua_redis.set("job_metadata:j", metadata.model_dump_json(), ex=600)
+        keys = ["job_metadata:j", "job:j:events", "job_version:j"]
+
+        assert cancel(keys=keys, args=["2026-01-01T00:00:00", 3600]) == 1
+        stored = json.loads(lua_redis.get("job_metadata:j"))
+        assert stored["status"] == "cancelled"
+        assert stored["completed_at"] == "2026-01-01T00:00:00"
+        assert lua_redis.ttl("job_metadata:j") > 0
+        assert lua_redis.get("job_version:j") == "1"
+
+        with pytest.raises(ResponseError, match="FINISHED"):
+            cancel(keys=keys, args=["2026-01-01T00:00:01", 3600])
+        assert cancel(keys=["job_metadata:missing", "job:missing:events", "job_version:missing"],
+                      args=["2026-01-01T00:00:00", 3600]) == 0
+
+
+class TestJobOwnerCheckScript:
+    """job_owner_check.lua existence and ownership check"""
+
+    def test_owner_check_outcomes(self, lua_redis):
+        """
+        Test ID: UT-LUA-001-04
+        A missing job should give 0, an unowned or own job 1 and another user's job FORBIDDEN.
+        """
+        owner_check = load_script(lua_redis, "job_owner_check.lua")
+        lua_redis.set("job_metadata:unowned", json.dumps({"job_id": "unowned", "user_id": None}))
+        lua_redis.set("job_metadata:owned", json.dumps({"job_id": "owned", "user_id": "user-1"}))
+        lua_redis.set("job_metadata:legacy", json.dumps({"job_id": "legacy"}))
+
+        assert owner_check(keys=["job_metadata:missing"], args=["user-1"]) == 0
+        assert owner_check(keys=["job_metadata:unowned"], args=["user-1"]) == 1
+        assert owner_check(keys=["job_metadata:legacy"], args=["user-1"]) == 1
+        assert owner_check(keys=["job_metadata:owned"], args=["user-1"]) == 1
+        with pytest.raises(ResponseError, match="FORBIDDEN"):
+            owner_check(keys=["job_metadata:owned"], args=["user-2"])